@@ -62,6 +62,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Lazily sets request.profile to the logged-in user's mini_insta Profile
+    'mini_insta.middleware.LoggedInProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -168,6 +170,34 @@ if socket.gethostname() == CS_DEPLOYMENT_HOSTNAME:
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Voter analytics list pagination: "keyset" (cursor links, constant cost per
+# page) or "offset" (numbered pages). Counts: "exact" or "estimated".
+VOTER_LIST_PAGINATION = 'keyset'
+VOTER_LIST_COUNT_MODE = 'exact'
+# Answer voter graphs and list counts from the VoterCube rollup rebuilt by each import
+VOTER_ANALYTICS_USE_CUBE = True
+# Serve voter filters from in-process NumPy column arrays (requires numpy)
+VOTER_ANALYTICS_ENGINE = False
+# Size limits of the in-process LRU of rendered voter list/graph pages
+VOTER_RESPONSE_CACHE_ENTRIES = 256
+VOTER_RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+# Where imports write memory-mapped engine snapshots shared by all workers
+VOTER_SNAPSHOT_DIR = os.path.join(BASE_DIR, 'voter_snapshots')
+# Draw the voter graphs in the browser from the stats API instead of embedding Plotly figures
+VOTER_GRAPHS_CLIENT_RENDER = True
+# Stratified (per-precinct) sample drawn at import for GraphsView's ?mode=approx;
+# VOTER_GRAPHS_MODE = 'approx' makes sampled graphs the default
+VOTER_GRAPHS_MODE = 'exact'
+VOTER_SAMPLE_SIZE = 20000
+VOTER_SAMPLE_MIN_PER_STRATUM = 50
+# mini_insta feeds are materialized per profile: posts by accounts with more
+# followers than this are fanned out on a background thread, and following a
+# profile adds up to MINI_INSTA_TIMELINE_BACKFILL of its recent posts
+MINI_INSTA_FANOUT_SYNC_LIMIT = 1000
+MINI_INSTA_TIMELINE_BACKFILL = 500
+# Posts per page (and per infinite-scroll fetch) of mini_insta's feed, profile and search lists
+MINI_INSTA_PAGE_SIZE = 20
+
 REST_FRAMEWORK = {
   'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
   'PAGE_SIZE': 10
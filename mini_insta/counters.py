@@ -0,0 +1,60 @@
+"""mini_insta/counters.py
+Stored post, follower, following, like and comment counts."""
+# file counters.py
+# author Kwabena Ampomah
+# description Helpers for the denormalized counters on Profile and Post.
+# Counters change with single UPDATE ... SET n = n + 1 statements (F()
+# expressions), so concurrent requests can't lose increments; reconcile_counts
+# recomputes them from the underlying rows.
+# https://docs.djangoproject.com/en/5.2/ref/models/expressions/#f-expressions
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Follow, Like, Post, Profile
+
+# model -> counter field -> (related model, foreign key on it pointing at the counted row)
+COUNTERS = {
+    Profile: {
+        'post_count': (Post, 'profile'),
+        'follower_count': (Follow, 'profile'),
+        'following_count': (Follow, 'follower_profile'),
+    },
+    Post: {
+        'like_count': (Like, 'post'),
+        'comment_count': (Comment, 'post'),
+    },
+}
+
+
+def adjust(model, pk, **deltas):
+    """Add `deltas` (field=+1/-1) to the stored counters of one row, never below zero."""
+    if pk is None:
+        return
+    model.objects.filter(pk=pk).update(
+        **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()}
+    )
+
+
+def _actual_count(related, fk):
+    counts = (related.objects.filter(**{fk: OuterRef('pk')}).order_by()
+              .values(fk).annotate(n=Count('pk')).values('n'))
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def reconcile_counts():
+    """Recompute every stored counter; returns {model name: rows corrected}."""
+    corrected = {}
+    with transaction.atomic():
+        for model, fields in COUNTERS.items():
+            actual = {f'actual_{field}': _actual_count(*source) for field, source in fields.items()}
+            rows = model.objects.annotate(**actual).values_list('pk', *fields, *actual)
+            fixed = 0
+            for pk, *values in rows.iterator():
+                stored, counted = values[:len(fields)], values[len(fields):]
+                if stored != counted:
+                    model.objects.filter(pk=pk).update(**dict(zip(fields, counted)))
+                    fixed += 1
+            corrected[model.__name__] = fixed
+    return corrected
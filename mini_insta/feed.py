@@ -0,0 +1,58 @@
+"""mini_insta/feed.py
+Loads posts ready to render as feed items and post cards."""
+# file feed.py
+# author Kwabena Ampomah
+# description Post assembler shared by the feed, post, profile and search pages.
+# Each post comes with its author, photo count, photos and (optionally)
+# comments with their authors, so a page of any length renders in a fixed
+# number of queries instead of several per post.
+# https://docs.djangoproject.com/en/5.2/ref/models/querysets/#prefetch-related
+# https://docs.djangoproject.com/en/5.2/ref/models/expressions/#subquery-expressions
+
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Photo, Post, TimelineEntry
+from .pagination import cursor_page
+
+
+def _count_per_post(model):
+    """Correlated COUNT of `model` rows for the outer post (0 when none)."""
+    counts = (model.objects.filter(post=OuterRef('pk')).order_by()
+              .values('post').annotate(n=Count('pk')).values('n'))
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def assemble_posts(posts, photos=True, comments=True):
+    """Return the `posts` queryset prepared for rendering.
+
+    Adds a `photo_count` annotation, joins each post's profile, and
+    prefetches `post.photos` (oldest first) and, when `comments` is True,
+    `post.comments` (oldest first, with profiles). Like and comment counts
+    are stored on Post. The photo count is a subquery so it doesn't multiply
+    joined rows.
+    """
+    posts = posts.select_related('profile').annotate(photo_count=_count_per_post(Photo))
+    if photos:
+        posts = posts.prefetch_related(
+            Prefetch('photo_set', queryset=Photo.objects.order_by('timestamp', 'pk'), to_attr='photos')
+        )
+    if comments:
+        posts = posts.prefetch_related(
+            Prefetch('comment_set', queryset=Comment.objects.select_related('profile').order_by('timestamp', 'pk'),
+                     to_attr='comments')
+        )
+    return posts
+
+
+def feed_page(profile, per_page, after=None):
+    """Return a CursorPage of `profile`'s feed, newest first, of assembled posts.
+
+    The page is read from the profile's timeline index, then its posts are
+    loaded in one query (see assemble_posts).
+    """
+    page = cursor_page(TimelineEntry.objects.filter(owner=profile), per_page, after, id_field='post_id')
+    posts = assemble_posts(Post.objects.filter(pk__in=[entry.post_id for entry in page]))
+    by_pk = {post.pk: post for post in posts}
+    page.object_list = [by_pk[entry.post_id] for entry in page if entry.post_id in by_pk]
+    return page
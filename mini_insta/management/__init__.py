@@ -0,0 +1 @@
+# Empty file to make directory a Python package
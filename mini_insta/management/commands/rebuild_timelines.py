@@ -0,0 +1,33 @@
+"""mini_insta/management/commands/rebuild_timelines.py
+Rewrites materialized feed timelines from the current Follow rows."""
+# file rebuild_timelines.py
+# author Kwabena Ampomah
+# description Rebuild mini_insta home timelines, e.g. after follows or posts
+# were changed outside the app's views (admin, shell, fixtures)
+#
+# Usage:
+#     python manage.py rebuild_timelines
+#     python manage.py rebuild_timelines --profile 3 --profile 7
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mini_insta.models import Profile
+from mini_insta.timeline import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = "Rebuild mini_insta feed timelines from the profiles each profile follows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', type=int, action='append', dest='profiles',
+                            help='Only rebuild this profile id (repeatable)')
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.all()
+        if options['profiles']:
+            profiles = profiles.filter(pk__in=options['profiles'])
+            missing = set(options['profiles']) - set(profiles.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f"No profile with id {', '.join(map(str, sorted(missing)))}")
+        count = rebuild_timelines(profiles)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} timelines"))
@@ -0,0 +1,23 @@
+"""mini_insta/management/commands/reconcile_counts.py
+Recomputes the stored Profile and Post counters."""
+# file reconcile_counts.py
+# author Kwabena Ampomah
+# description Repair drift in the stored post/follower/following/like/comment
+# counts, e.g. after loading fixtures or bulk changes that skip model signals
+#
+# Usage:
+#     python manage.py reconcile_counts
+
+from django.core.management.base import BaseCommand
+
+from mini_insta.counters import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute mini_insta's stored post, follower, following, like and comment counts"
+
+    def handle(self, *args, **options):
+        corrected = reconcile_counts()
+        for model, fixed in corrected.items():
+            self.stdout.write(f"{model}: corrected {fixed} row{'s' if fixed != 1 else ''}")
+        self.stdout.write(self.style.SUCCESS("Counters reconciled"))
@@ -0,0 +1,55 @@
+"""mini_insta/middleware.py
+Attaches the logged-in user's Profile to each request."""
+# file middleware.py
+# author Kwabena Ampomah
+# description request.profile is the current user's Profile (or None), looked
+# up lazily on first use and then reused for the rest of the request, like
+# request.user. The profile's id is remembered in the session, so later
+# requests fetch it by primary key; the user check keeps a stale id harmless.
+# https://docs.djangoproject.com/en/5.2/topics/http/middleware/
+
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+
+SESSION_KEY = '_mini_insta_profile_id'
+
+
+def get_request_profile(request):
+    """Return the Profile of the user making `request`, or None; cached on the request."""
+    if not hasattr(request, '_cached_profile'):
+        request._cached_profile = _lookup_profile(request)
+    return request._cached_profile
+
+
+def _lookup_profile(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    session = getattr(request, 'session', None)
+    cached_id = session.get(SESSION_KEY) if session is not None else None
+    if cached_id is not None:
+        profile = Profile.objects.filter(pk=cached_id, user=user).first()
+        if profile is not None:
+            return profile
+    profile = Profile.objects.filter(user=user).first()
+    if session is not None:
+        if profile is not None:
+            session[SESSION_KEY] = profile.pk
+        else:
+            session.pop(SESSION_KEY, None)
+    return profile
+
+
+class LoggedInProfileMiddleware:
+    """Set request.profile to a lazy lookup of the logged-in user's Profile.
+
+    Must come after AuthenticationMiddleware, which provides request.user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(lambda: get_request_profile(request))
+        return self.get_response(request)
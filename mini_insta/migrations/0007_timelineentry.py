@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_timelines(apps, schema_editor):
+    """Write the existing feeds: every followed profile's posts, for each follower."""
+    Follow = apps.get_model('mini_insta', 'Follow')
+    Post = apps.get_model('mini_insta', 'Post')
+    TimelineEntry = apps.get_model('mini_insta', 'TimelineEntry')
+    posts = {}
+    for pk, author_id, timestamp in Post.objects.values_list('pk', 'profile_id', 'timestamp'):
+        posts.setdefault(author_id, []).append((pk, timestamp))
+    entries = [
+        TimelineEntry(owner_id=follower_id, post_id=pk, author_id=author_id, timestamp=timestamp)
+        for follower_id, author_id in Follow.objects.values_list('follower_profile_id', 'profile_id').distinct()
+        for pk, timestamp in posts.get(author_id, [])
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mini_insta', '0006_backfill_profile_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mini_insta.profile')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='mini_insta.profile')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='mini_insta.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', '-timestamp', '-post'], name='timeline_owner_recent_idx'), models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'post'), name='timeline_entry_unique')],
+            },
+        ),
+        migrations.RunPython(build_timelines, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:28
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(model, fk):
+    counts = (model.objects.filter(**{fk: OuterRef('pk')}).order_by()
+              .values(fk).annotate(n=Count('pk')).values('n'))
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    """Set the new counters from the existing posts, follows, likes and comments."""
+    Profile = apps.get_model('mini_insta', 'Profile')
+    Post = apps.get_model('mini_insta', 'Post')
+    Follow = apps.get_model('mini_insta', 'Follow')
+    Like = apps.get_model('mini_insta', 'Like')
+    Comment = apps.get_model('mini_insta', 'Comment')
+    Profile.objects.update(
+        post_count=_count(Post, 'profile'),
+        follower_count=_count(Follow, 'profile'),
+        following_count=_count(Follow, 'follower_profile'),
+    )
+    Post.objects.update(like_count=_count(Like, 'post'), comment_count=_count(Comment, 'post'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mini_insta', '0007_timelineentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mini_insta', '0008_profile_post_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['profile', '-timestamp', '-id'], name='post_profile_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-timestamp', '-id'], name='post_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:31
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def detach_older_profiles(apps, schema_editor):
+    """Keep each user's newest profile (the one the views already used) and
+    detach the older ones, so the user column can be made unique. Detached
+    profiles keep their posts and follows."""
+    Profile = apps.get_model('mini_insta', 'Profile')
+    duplicated = (Profile.objects.filter(user__isnull=False).order_by()
+                  .values('user').annotate(n=Count('pk'), newest=Max('pk')).filter(n__gt=1))
+    for row in duplicated:
+        Profile.objects.filter(user_id=row['user']).exclude(pk=row['newest']).update(user=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mini_insta', '0009_post_recent_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_older_profiles, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='profile',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user',), name='profile_unique_user'),
+        ),
+    ]
@@ -5,8 +5,12 @@ contains reusable mixins for the mini_insta app."""
 # description Reusable mixins for the mini_insta app
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import reverse_lazy
-from .models import Profile
+from django.core.exceptions import ImproperlyConfigured
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
+from .middleware import get_request_profile
+from .pagination import cursor_page, page_size
 
 
 class AuthMixin(LoginRequiredMixin):
@@ -16,8 +20,71 @@ class AuthMixin(LoginRequiredMixin):
     redirect_field_name = 'next'
 
     def get_logged_in_profile(self):
-        """Return a Profile for the current user; pick newest if multiple."""
-        if not self.request.user.is_authenticated:
+        """Return the current user's Profile (None if logged out or without one).
+
+        Looked up once per request and shared with request.profile (see
+        middleware.py).
+        """
+        return get_request_profile(self.request)
+
+
+class CursorPageMixin:
+    """Page a view's posts newest-first with an opaque ?after= cursor.
+
+    Views set cursor_queryset or override get_cursor_queryset(); views whose
+    pages come from elsewhere override get_cursor_page(per_page, after) and
+    return a CursorPage. The same view routed with as_view(fragment=True)
+    answers with JSON {"html", "next", "next_page"}: the page's posts rendered
+    with fragment_template_name, and the URLs of the next fragment and full
+    page (null on the last page), for infinite scroll.
+    """
+
+    fragment = False
+    fragment_template_name = None
+    # Posts to page, newest first by (timestamp, id)
+    cursor_queryset = None
+    # URL names of the full page and its fragment endpoint (same kwargs)
+    page_url_name = None
+    fragment_url_name = None
+
+    def get_cursor_queryset(self):
+        """Return the posts to page; cursor_queryset unless overridden."""
+        if self.cursor_queryset is None:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} is missing cursor_queryset; define it or override get_cursor_queryset()"
+            )
+        return self.cursor_queryset.all()
+
+    def get_cursor_page(self, per_page, after):
+        """Return the CursorPage of get_cursor_queryset() following the `after` cursor."""
+        return cursor_page(self.get_cursor_queryset(), per_page, after)
+
+    def get_page(self):
+        if not hasattr(self, '_page'):
+            self._page = self.get_cursor_page(page_size(), self.request.GET.get('after') or None)
+        return self._page
+
+    def get_next_url(self, url_name):
+        """URL of the page after this one under `url_name`, keeping other query parameters."""
+        cursor = self.get_page().next_cursor
+        if cursor is None:
             return None
-        return Profile.objects.filter(user=self.request.user).order_by('-pk').first()
+        params = self.request.GET.copy()
+        params['after'] = cursor
+        return f"{reverse(url_name, kwargs=self.kwargs)}?{params.urlencode()}"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_page_url'] = self.get_next_url(self.page_url_name)
+        context['next_fragment_url'] = self.get_next_url(self.fragment_url_name)
+        return context
 
+    def get(self, request, *args, **kwargs):
+        if not self.fragment:
+            return super().get(request, *args, **kwargs)
+        html = render_to_string(self.fragment_template_name, {'posts': self.get_page().object_list}, request=request)
+        return JsonResponse({
+            'html': html,
+            'next': self.get_next_url(self.fragment_url_name),
+            'next_page': self.get_next_url(self.page_url_name),
+        })
@@ -27,6 +27,19 @@ class Profile(models.Model):
         blank=True,
         related_name='profiles'
     )
+    # Stored counters, kept current by the receivers in signals.py
+    # (reconcile_counts repairs any drift)
+    post_count = models.PositiveIntegerField(default=0)
+    follower_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # One profile per user; its unique index serves the logged-in profile lookup
+            models.UniqueConstraint(
+                fields=['user'], condition=models.Q(user__isnull=False), name='profile_unique_user'
+            ),
+        ]
 
     def __str__(self):
         """Return the display name for convenient admin/console display."""
@@ -43,7 +56,7 @@ class Profile(models.Model):
 
     def get_num_followers(self):
         """Return the number of followers for this profile."""
-        return Follow.objects.filter(profile=self).count()
+        return self.follower_count
 
     def get_following(self):
         """Return a list of Profiles that this profile is following."""
@@ -51,13 +64,19 @@ class Profile(models.Model):
 
     def get_num_following(self):
         """Return the number of profiles this profile is following."""
-        return Follow.objects.filter(follower_profile=self).count()
+        return self.following_count
 
     # --- Feed accessor ---
     def get_post_feed(self):
-        """Return Posts from profiles this profile follows, newest first."""
-        following_profiles = self.get_following()
-        return Post.objects.filter(profile__in=following_profiles).order_by('-timestamp')
+        """Return Posts from profiles this profile follows, newest first.
+
+        Reads this profile's materialized timeline (see timeline.py), so the
+        feed is one range of the TimelineEntry index however many profiles
+        are followed.
+        """
+        return Post.objects.filter(timeline_entries__owner=self).order_by(
+            '-timeline_entries__timestamp', '-timeline_entries__post'
+        )
 
     def get_absolute_url(self):
         """Return the URL for this profile's detail page.
@@ -71,6 +90,16 @@ class Post(models.Model):
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
     timestamp = models.DateTimeField(auto_now_add=True)
     caption = models.TextField(blank=True)
+    # Stored counters, kept current by the receivers in signals.py
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Newest-first cursor pages of a profile's posts and of all posts (search)
+            models.Index(fields=['profile', '-timestamp', '-id'], name='post_profile_recent_idx'),
+            models.Index(fields=['-timestamp', '-id'], name='post_recent_idx'),
+        ]
 
     def __str__(self):
         """Return a readable description containing author and timestamp."""
@@ -155,3 +184,26 @@ class Like(models.Model):
 
     def __str__(self):
         return f"{self.profile.display_name} liked a post by {self.post.profile.display_name}"
+
+
+class TimelineEntry(models.Model):
+    """A post in a profile's home feed, written when the post is created or
+    its author is followed (fan-out on write, see timeline.py)."""
+    owner = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='timeline_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    # The post's author, so unfollowing can prune the author's entries
+    author = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='+')
+    # Copy of post.timestamp so the feed is read in index order
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='timeline_entry_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-timestamp', '-post'], name='timeline_owner_recent_idx'),
+            models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.post} in {self.owner.display_name}'s feed"
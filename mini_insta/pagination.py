@@ -0,0 +1,75 @@
+"""mini_insta/pagination.py
+Cursor pagination for newest-first post lists."""
+# file pagination.py
+# author Kwabena Ampomah
+# description Pages are addressed by an opaque cursor holding the (timestamp, id)
+# of the last row shown, and the next page is the rows strictly older than it.
+# With an index on (timestamp, id) every page is a short index range read,
+# however far back the reader has scrolled, unlike an ever larger OFFSET.
+# https://docs.djangoproject.com/en/5.2/topics/db/queries/#complex-lookups-with-q-objects
+
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+
+def page_size():
+    """Posts per page of the feed, profile and search lists."""
+    return getattr(settings, 'MINI_INSTA_PAGE_SIZE', 20)
+
+
+def encode_cursor(timestamp, pk):
+    """Return an opaque, URL-safe cursor for a row's (timestamp, id)."""
+    key = [timestamp.isoformat(), pk]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return the (timestamp, id) held by a cursor, or None if it is malformed."""
+    try:
+        timestamp, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+class CursorPage:
+    """One page of a cursor-paginated list, with the cursor of the page after it."""
+
+    def __init__(self, object_list, next_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def cursor_page(qs, per_page, after=None, timestamp_field='timestamp', id_field='pk'):
+    """Return the page of `qs`, newest first, following the `after` cursor.
+
+    `timestamp_field` and `id_field` name the sort key; an index on them (in
+    that order, after any equality filters) keeps each page an index range.
+    A malformed cursor is treated as no cursor.
+    """
+    key = decode_cursor(after) if after else None
+    if key:
+        timestamp, pk = key
+        # The leading bound starts the range scan; the OR resolves equal timestamps
+        qs = qs.filter(**{f'{timestamp_field}__lte': timestamp}).filter(
+            Q(**{f'{timestamp_field}__lt': timestamp}) | Q(**{timestamp_field: timestamp, f'{id_field}__lt': pk})
+        )
+    rows = list(qs.order_by(f'-{timestamp_field}', f'-{id_field}')[:per_page + 1])
+    page = CursorPage(rows[:per_page])
+    if len(rows) > per_page:
+        last = page.object_list[-1]
+        page.next_cursor = encode_cursor(getattr(last, timestamp_field), getattr(last, id_field))
+    return page
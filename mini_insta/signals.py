@@ -0,0 +1,44 @@
+"""mini_insta/signals.py
+Keeps the stored counters on Profile and Post current."""
+# file signals.py
+# author Kwabena Ampomah
+# description Receivers that adjust Profile/Post counters when posts, follows,
+# likes and comments are created or deleted, whether from the views, the
+# admin, or cascading deletes. Fixture loading (raw saves) is skipped; run
+# reconcile_counts afterwards.
+# https://docs.djangoproject.com/en/5.2/topics/signals/
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import adjust
+from .models import Comment, Follow, Like, Post, Profile
+
+
+def _adjust_for(instance, delta):
+    if isinstance(instance, Post):
+        adjust(Profile, instance.profile_id, post_count=delta)
+    elif isinstance(instance, Follow):
+        adjust(Profile, instance.profile_id, follower_count=delta)
+        adjust(Profile, instance.follower_profile_id, following_count=delta)
+    elif isinstance(instance, Like):
+        adjust(Post, instance.post_id, like_count=delta)
+    elif isinstance(instance, Comment):
+        adjust(Post, instance.post_id, comment_count=delta)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Follow)
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+def count_created(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        _adjust_for(instance, 1)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Follow)
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+def count_deleted(sender, instance, **kwargs):
+    _adjust_for(instance, -1)
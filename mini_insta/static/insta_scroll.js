@@ -0,0 +1,68 @@
+// file insta_scroll.js
+// author Kwabena Ampomah
+// description Infinite scroll for mini_insta post lists. Each "Load more" link
+// (see _load_more.html) follows a [data-scroll-list] container; when the link
+// comes into view its JSON fragment endpoint is fetched, the returned HTML is
+// appended to the list, and the link moves on to the next page (or is removed
+// after the last one). Without JavaScript the link loads the next full page.
+// https://developer.mozilla.org/en-US/docs/Web/API/Intersection_Observer_API
+
+(function () {
+  function setUp(link) {
+    var wrapper = link.parentElement;
+    var list = wrapper.previousElementSibling;
+    if (!list || !list.hasAttribute("data-scroll-list")) {
+      return;
+    }
+    var loading = false;
+
+    function loadNext() {
+      var url = link.getAttribute("data-fragment-url");
+      if (loading || !url) {
+        return;
+      }
+      loading = true;
+      fetch(url, { headers: { Accept: "application/json" }, credentials: "same-origin" })
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error("HTTP " + response.status);
+          }
+          return response.json();
+        })
+        .then(function (page) {
+          list.insertAdjacentHTML("beforeend", page.html);
+          if (page.next) {
+            link.setAttribute("data-fragment-url", page.next);
+            link.setAttribute("href", page.next_page);
+            loading = false;
+          } else {
+            observer && observer.disconnect();
+            wrapper.remove();
+          }
+        })
+        .catch(function () {
+          // Leave the plain link in place so the reader can still page on
+          loading = false;
+        });
+    }
+
+    link.addEventListener("click", function (event) {
+      event.preventDefault();
+      loadNext();
+    });
+
+    var observer = null;
+    if ("IntersectionObserver" in window) {
+      observer = new IntersectionObserver(function (entries) {
+        if (entries.some(function (entry) { return entry.isIntersecting; })) {
+          loadNext();
+        }
+      }, { rootMargin: "400px 0px" });
+      observer.observe(link);
+    }
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll(".load-more a[data-fragment-url]").forEach(setUp);
+  });
+})();
@@ -0,0 +1,111 @@
+"""mini_insta/timeline.py
+Materialized home timelines (fan-out on write).
+
+Each profile's feed is stored as TimelineEntry rows instead of being computed
+from the profiles it follows on every request. A new post is written to each
+follower's timeline (on a background thread for accounts with many followers),
+following a profile backfills its recent posts, and unfollowing prunes them.
+Deleting a post or profile removes its entries through the foreign keys.
+"""
+# file timeline.py
+# author Kwabena Ampomah
+# description Fan-out-on-write home timelines for the mini_insta feed
+# https://docs.djangoproject.com/en/5.2/ref/models/querysets/#bulk-create
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Follow, Post, Profile, TimelineEntry
+
+logger = logging.getLogger(__name__)
+
+# Rows per bulk insert when writing timelines
+BATCH_SIZE = 1000
+
+
+def fanout_sync_limit():
+    """Followers above which a new post is fanned out on a background thread."""
+    return getattr(settings, 'MINI_INSTA_FANOUT_SYNC_LIMIT', 1000)
+
+
+def backfill_limit():
+    """How many of a profile's most recent posts are added to a new follower's feed."""
+    return getattr(settings, 'MINI_INSTA_TIMELINE_BACKFILL', 500)
+
+
+def _write_entries(owner_ids, post):
+    """Add `post` to the timelines of the profiles in `owner_ids`."""
+    batch = []
+    for owner_id in owner_ids:
+        batch.append(TimelineEntry(owner_id=owner_id, post_id=post.pk,
+                                   author_id=post.profile_id, timestamp=post.timestamp))
+        if len(batch) >= BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def _fan_out_in_background(post):
+    try:
+        follower_ids = Follow.objects.filter(profile_id=post.profile_id).values_list(
+            'follower_profile_id', flat=True
+        )
+        _write_entries(follower_ids.iterator(chunk_size=BATCH_SIZE), post)
+    except Exception:
+        logger.exception('Timeline fan-out failed for post %s', post.pk)
+    finally:
+        # The thread's own database connection
+        connection.close()
+
+
+def fan_out_post(post):
+    """Write a new post to its author's followers' timelines.
+
+    Small audiences are written before the response; larger ones on a thread
+    started once the post is committed, so the author is not kept waiting.
+    """
+    if post.profile.follower_count <= fanout_sync_limit():
+        followers = Follow.objects.filter(profile_id=post.profile_id)
+        _write_entries(followers.values_list('follower_profile_id', flat=True), post)
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(target=_fan_out_in_background, args=(post,), daemon=True).start()
+    )
+
+
+def backfill_follow(follower, profile):
+    """Add `profile`'s most recent posts to `follower`'s timeline."""
+    posts = Post.objects.filter(profile=profile).order_by('-timestamp', '-pk')[:backfill_limit()]
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(owner=follower, post_id=pk, author=profile, timestamp=timestamp)
+         for pk, timestamp in posts.values_list('pk', 'timestamp')],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def prune_follow(follower, profile):
+    """Remove `profile`'s posts from `follower`'s timeline."""
+    TimelineEntry.objects.filter(owner=follower, author=profile).delete()
+
+
+def rebuild_timeline(profile):
+    """Rewrite a profile's timeline from the profiles it currently follows."""
+    with transaction.atomic():
+        TimelineEntry.objects.filter(owner=profile).delete()
+        for follow in Follow.objects.filter(follower_profile=profile).select_related('profile'):
+            backfill_follow(profile, follow.profile)
+
+
+def rebuild_timelines(profiles=None):
+    """Rebuild the timelines of `profiles` (default: every profile); returns how many."""
+    profiles = Profile.objects.all() if profiles is None else profiles
+    count = 0
+    for profile in profiles:
+        rebuild_timeline(profile)
+        count += 1
+    return count
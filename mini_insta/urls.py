@@ -13,6 +13,7 @@ urlpatterns = [
     path('profiles/', views.ProfileListView.as_view(), name='profile-list'),
     path('profile/<int:pk>/', views.ProfileDetailView.as_view(), name='show_profile'),
     path('post/<int:pk>/', views.PostDetailView.as_view(), name='show_post'),
+    path('profile/<int:pk>/posts/', views.ProfileDetailView.as_view(fragment=True), name='show_profile_posts'),
 
     # Followers / Following (public)
     path('profile/<int:pk>/followers/', views.ShowFollowersDetailView.as_view(), name='show_followers'),
@@ -24,6 +25,10 @@ urlpatterns = [
     path('profile/feed/', views.PostFeedListView.as_view(), name='show_feed'),
     path('profile/search/', views.SearchView.as_view(), name='search'),
 
+    # JSON pages of posts for infinite scroll (see CursorPageMixin)
+    path('profile/feed/posts/', views.PostFeedListView.as_view(fragment=True), name='show_feed_posts'),
+    path('profile/search/posts/', views.SearchView.as_view(fragment=True), name='search_posts'),
+
     # Registration (public)
     path('create_profile/', views.CreateProfileView.as_view(), name='create_profile'),
 
@@ -10,6 +10,7 @@ and posts.
 # description Views for the mini_insta app
 
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, View, TemplateView
 from django.urls import reverse, reverse_lazy
 from django.db.models import Q
@@ -17,7 +18,11 @@ from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
 from .models import Profile, Post, Photo, Like, Follow
 from .forms import CreatePostForm, UpdateProfileForm, CreateProfileForm
-from .mixins import AuthMixin
+from .mixins import AuthMixin, CursorPageMixin
+from .middleware import get_request_profile
+from .feed import assemble_posts, feed_page
+from .pagination import CursorPage
+from .timeline import backfill_follow, fan_out_post, prune_follow
 
 # Create your views here.
 class ProfileListView(ListView):
@@ -26,18 +31,25 @@ class ProfileListView(ListView):
     template_name = 'insta/show_all_profiles.html'
     context_object_name = 'profiles'
 
-class ProfileDetailView(DetailView):
-    """Show a single profile and its details."""
+class ProfileDetailView(CursorPageMixin, DetailView):
+    """Show a single profile, its details and a page of its posts."""
     model = Profile
     template_name = 'insta/show_profile.html'
     context_object_name = 'profile'
-    
+    fragment_template_name = 'insta/_post_cards.html'
+    page_url_name = 'show_profile'
+    fragment_url_name = 'show_profile_posts'
+
+    def get_cursor_queryset(self):
+        """This profile's posts, ready to render as cards."""
+        profile = getattr(self, 'object', None) or self.get_object()
+        return assemble_posts(profile.get_all_posts(), comments=False)
+
     def get_context_data(self, **kwargs):
-        """Add flags for ownership and follow state for the logged-in user."""
+        """Add the profile's posts and flags for ownership and follow state."""
         context = super().get_context_data(**kwargs)
-        me = None
-        if self.request.user.is_authenticated:
-            me = Profile.objects.filter(user=self.request.user).order_by('-pk').first()
+        context['posts'] = self.get_page().object_list
+        me = get_request_profile(self.request)
         context['can_update'] = bool(me and self.object.user_id == self.request.user.id)
         context['can_follow'] = bool(me and me.pk != self.object.pk)
         if me and me.pk != self.object.pk:
@@ -52,13 +64,15 @@ class PostDetailView(DetailView):
     template_name = 'insta/show_post.html'
     context_object_name = 'post'
 
+    def get_queryset(self):
+        """Load the post with its author, counts, photos and comments."""
+        return assemble_posts(Post.objects.all())
+
     def get_context_data(self, **kwargs):
         """Add the author's profile for navigation context if needed."""
         context = super().get_context_data(**kwargs)
         context['profile'] = self.object.profile
-        me = None
-        if self.request.user.is_authenticated:
-            me = Profile.objects.filter(user=self.request.user).order_by('-pk').first()
+        me = get_request_profile(self.request)
         context['can_edit_post'] = bool(me and self.object.profile_id == me.id)
         context['can_like'] = bool(me and self.object.profile_id != me.id)
         context['has_liked'] = bool(me and Like.objects.filter(profile=me, post=self.object).exists())
@@ -88,7 +102,9 @@ class CreatePostView(AuthMixin, CreateView):
         files = self.request.FILES.getlist('files')
         for f in files:
             Photo.objects.create(post=self.object, image_file=f)
-        
+
+        # Deliver the post to followers' feeds
+        fan_out_post(self.object)
         return response
     # https://django.readthedocs.io/en/5.2.x/ref/forms/index.html
     def get_success_url(self):
@@ -165,16 +181,22 @@ class ShowFollowingDetailView(DetailView):
     context_object_name = 'profile'
 
 
-class PostFeedListView(AuthMixin, ListView):
-    """ListView that shows the post feed for the logged-in user."""
+class PostFeedListView(AuthMixin, CursorPageMixin, ListView):
+    """ListView that shows the post feed for the logged-in user, a page at a time."""
     template_name = 'insta/show_feed.html'
     context_object_name = 'posts'
+    fragment_template_name = 'insta/_feed_posts.html'
+    page_url_name = 'show_feed'
+    fragment_url_name = 'show_feed_posts'
 
-    def get_queryset(self):
+    def get_cursor_page(self, per_page, after):
         self.profile = self.get_logged_in_profile()
         if not self.profile:
-            return Post.objects.none()
-        return self.profile.get_post_feed()
+            return CursorPage([])
+        return feed_page(self.profile, per_page, after)
+
+    def get_queryset(self):
+        return self.get_page().object_list
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -182,22 +204,30 @@ class PostFeedListView(AuthMixin, ListView):
         return context
 
 
-class SearchView(AuthMixin, ListView):
+class SearchView(AuthMixin, CursorPageMixin, ListView):
     """Search Profiles and Posts. Shows a search form or results."""
     template_name = 'insta/search_results.html'
     context_object_name = 'posts'
+    fragment_template_name = 'insta/_search_posts.html'
+    page_url_name = 'search'
+    fragment_url_name = 'search_posts'
 
     def dispatch(self, request, *args, **kwargs):
         self.profile = self.get_logged_in_profile()
         self.query = request.GET.get('query', '').strip()
         if not self.query:
+            if self.fragment:
+                return JsonResponse({'html': '', 'next': None, 'next_page': None})
             # No query provided: show the search form
             return render(request, 'insta/search.html', {'profile': self.profile})
         return super().dispatch(request, *args, **kwargs)
 
-    def get_queryset(self):
+    def get_cursor_queryset(self):
         # Posts that contain the query in the caption
-        return Post.objects.filter(caption__icontains=self.query).order_by('-timestamp')
+        return assemble_posts(Post.objects.filter(caption__icontains=self.query), photos=False, comments=False)
+
+    def get_queryset(self):
+        return self.get_page().object_list
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -241,7 +271,9 @@ class FollowView(AuthMixin, View):
         me = self.get_logged_in_profile()
         other = get_object_or_404(Profile, pk=pk)
         if me and other and me.pk != other.pk:
-            Follow.objects.get_or_create(follower_profile=me, profile=other)
+            _, created = Follow.objects.get_or_create(follower_profile=me, profile=other)
+            if created:
+                backfill_follow(me, other)
         return redirect(other.get_absolute_url())
 
 
@@ -251,6 +283,7 @@ class UnfollowView(AuthMixin, View):
         other = get_object_or_404(Profile, pk=pk)
         if me and other:
             Follow.objects.filter(follower_profile=me, profile=other).delete()
+            prune_follow(me, other)
         return redirect(other.get_absolute_url())
 
 
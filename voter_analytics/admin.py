@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Voter
+from .models import ImportRun, Voter
+from .search import search_voters
 
 
 @admin.register(Voter)
@@ -16,3 +17,14 @@ class VoterAdmin(admin.ModelAdmin):
     )
     list_filter = ("party", "precinct", "v20state", "v21town", "v21primary", "v22general", "v23town")
     search_fields = ("last_name", "first_name", "street_name", "zipcode")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the trigram search index instead of icontains scans over search_fields
+        queryset, _ = search_voters(queryset, search_term)
+        return queryset, False
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = ("pk", "finished", "source", "rows", "created", "updated", "deleted")
+    readonly_fields = ("finished", "source", "rows", "created", "updated", "deleted")
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VoterAnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'voter_analytics'
+
+    def ready(self):
+        # Register the PrecinctStats maintenance receivers
+        from . import signals  # noqa: F401
@@ -0,0 +1,121 @@
+"""
+File: voter_analytics/charts.py
+Author: kwabena <kwabena@bu.edu>
+Description: Plotly figure rendering for GraphsView. Rendered figure fragments
+are cached in Django's cache by filter signature and data generation, since
+building and serializing the figures costs far more than computing the series.
+plotly.js itself is vendored by the vendor_plotlyjs command as a content-hashed
+file under the app's static directory and served with long-lived cache headers,
+falling back to the Plotly CDN until it has been vendored.
+
+References:
+- Plotly figure to_html: https://plotly.com/python-api-reference/generated/plotly.io.to_html.html
+- Django cache framework: https://docs.djangoproject.com/en/stable/topics/cache/
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from .metadata import METADATA_TIMEOUT, generation_key
+
+PLOTLY_DIR = Path(__file__).resolve().parent / "static" / "voter_analytics" / "js"
+# plotly-<version>.<content hash>.min.js; write_vendored_plotly keeps only the newest
+PLOTLY_PATTERN = "plotly-*.min.js"
+
+
+def vendored_plotly_name() -> Optional[str]:
+    """Return the file name of the vendored plotly.js bundle, or None if it has not been vendored."""
+    names = sorted(path.name for path in PLOTLY_DIR.glob(PLOTLY_PATTERN))
+    return names[-1] if names else None
+
+
+def plotly_js_url() -> Optional[str]:
+    """Return the URL pages should load plotly.js from: the vendored copy, else the CDN."""
+    name = vendored_plotly_name()
+    if name:
+        return reverse("voter_analytics:plotly_js", kwargs={"filename": name})
+    try:
+        from plotly.offline import get_plotlyjs_version
+    except ImportError:
+        return None
+    return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def write_vendored_plotly() -> str:
+    """Write the installed plotly package's plotly.js as a content-hashed file; returns its path."""
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    bundle = get_plotlyjs().encode("utf-8")
+    digest = hashlib.sha256(bundle).hexdigest()[:12]
+    name = f"plotly-{get_plotlyjs_version()}.{digest}.min.js"
+    os.makedirs(PLOTLY_DIR, exist_ok=True)
+    with open(PLOTLY_DIR / name, "wb") as fh:
+        fh.write(bundle)
+    for old in PLOTLY_DIR.glob(PLOTLY_PATTERN):
+        if old.name != name:
+            old.unlink()
+    return str(PLOTLY_DIR / name)
+
+
+def _error_bars(counts, intervals) -> Dict:
+    """px.bar error_y/error_y_minus arguments for approximate series' confidence intervals."""
+    if intervals is None:
+        return {}
+    return {
+        "error_y": [high - n for n, (_, high) in zip(counts, intervals)],
+        "error_y_minus": [n - low for n, (low, _) in zip(counts, intervals)],
+    }
+
+
+def _build_figures(series: Dict) -> Dict:
+    import plotly.express as px
+
+    figures = {"birth_year": None, "party": None, "elections": None}
+    intervals = series.get("intervals") or {}
+
+    # Birth year distribution
+    if series["birth_years"]:
+        years = [year for year, _ in series["birth_years"]]
+        counts = [n for _, n in series["birth_years"]]
+        fig = px.bar(x=years, y=counts, labels={"x": "Birth Year", "y": "Voters"}, title="Voters by Birth Year",
+                     **_error_bars(counts, intervals.get("birth_years")))
+        figures["birth_year"] = fig.to_html(full_html=False, include_plotlyjs=False)
+
+    # Party affiliation distribution
+    if series["parties"]:
+        labels = [party for party, _ in series["parties"]]
+        values = [n for _, n in series["parties"]]
+        fig = px.pie(names=labels, values=values, title="Voters by Party Affiliation")
+        figures["party"] = fig.to_html(full_html=False, include_plotlyjs=False)
+
+    # Participation counts per election
+    labels = [label for label, _ in series["elections"]]
+    values = [n for _, n in series["elections"]]
+    fig = px.bar(x=labels, y=values, labels={"x": "Election", "y": "Voted"}, title="Participation by Election",
+                 **_error_bars(values, intervals.get("elections")))
+    figures["elections"] = fig.to_html(full_html=False, include_plotlyjs=False)
+    return figures
+
+
+def render_figures(series: Dict, signature: str) -> Dict:
+    """
+    Return HTML fragments for the birth year, party and election charts.
+
+    Fragments are cached under the filter `signature` for the current data
+    generation. Values are None when Plotly is unavailable or a series is empty.
+    """
+    key = generation_key(f"figures:{hashlib.sha1(signature.encode('utf-8')).hexdigest()}")
+    figures = cache.get(key)
+    if figures is None:
+        try:
+            figures = _build_figures(series)
+        except Exception:
+            # Plotly missing or failing; the template shows a helpful message
+            return {"birth_year": None, "party": None, "elections": None}
+        cache.set(key, figures, METADATA_TIMEOUT)
+    return figures
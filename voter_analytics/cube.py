@@ -0,0 +1,111 @@
+"""
+File: voter_analytics/cube.py
+Author: kwabena <kwabena@bu.edu>
+Description: Precomputed aggregate cube for voter analytics. VoterFilterForm only
+filters on party, birth year, voter_score and the five election flags, so the
+counts behind GraphsView and the list totals can be answered by summing the
+matching VoterCube cells in the database instead of scanning Voter.
+
+Reference: Django query expressions - https://docs.djangoproject.com/en/stable/ref/models/expressions/
+"""
+
+from typing import Dict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, QuerySet, Sum, Value, When
+
+from .models import ELECTIONS, ELECTION_FLAGS, Voter, VoterCube
+
+
+def flag_bit(flag: str) -> int:
+    """Return the bitmask bit for an election flag."""
+    return 1 << ELECTION_FLAGS.index(flag)
+
+
+def flags_expression():
+    """Database expression computing a voter's election bitmask."""
+    return sum(
+        Case(When(**{flag: True}, then=Value(flag_bit(flag))), default=Value(0))
+        for flag in ELECTION_FLAGS
+    )
+
+
+def rebuild_cube() -> int:
+    """Replace the cube with a fresh GROUP BY over Voter; returns the number of cells."""
+    rows = (
+        Voter.objects.order_by()
+        .annotate(mask=flags_expression())
+        .values_list("party", "birth_year", "voter_score", "mask")
+        .annotate(n=Count("pk"))
+    )
+    cells = [
+        VoterCube(party=party, birth_year=year, voter_score=score, flags=mask, count=n)
+        for party, year, score, mask, n in rows
+    ]
+    with transaction.atomic():
+        VoterCube.objects.all().delete()
+        VoterCube.objects.bulk_create(cells, batch_size=5000)
+    return len(cells)
+
+
+def cube_available() -> bool:
+    """Whether views should answer from the cube (VOTER_ANALYTICS_USE_CUBE and a built cube)."""
+    return getattr(settings, "VOTER_ANALYTICS_USE_CUBE", True) and VoterCube.objects.exists()
+
+
+def filter_cells(cells: QuerySet, cleaned_data: Dict) -> QuerySet:
+    """
+    Apply VoterFilterForm data to a queryset of a model with party, birth_year,
+    voter_score and a `flags` election bitmask (VoterCube, VoterSample).
+    """
+    party = cleaned_data.get("party")
+    if party:
+        cells = cells.filter(party=party)
+    min_year = cleaned_data.get("dob_min_year")
+    max_year = cleaned_data.get("dob_max_year")
+    if min_year:
+        cells = cells.filter(birth_year__gte=int(min_year))
+    if max_year:
+        cells = cells.filter(birth_year__lte=int(max_year))
+    score = cleaned_data.get("voter_score")
+    if score not in (None, ""):
+        cells = cells.filter(voter_score=int(score))
+    required = sum(flag_bit(flag) for flag in ELECTION_FLAGS if cleaned_data.get(flag))
+    if required:
+        cells = cells.annotate(required=F("flags").bitand(required)).filter(required=required)
+    return cells
+
+
+def cube_cells(cleaned_data: Dict) -> QuerySet:
+    """Return the VoterCube cells matching VoterFilterForm data."""
+    return filter_cells(VoterCube.objects.order_by(), cleaned_data)
+
+
+def cube_count(cleaned_data: Dict) -> int:
+    """Return the exact number of voters matching VoterFilterForm data."""
+    return cube_cells(cleaned_data).aggregate(n=Sum("count"))["n"] or 0
+
+
+def cube_series(cleaned_data: Dict) -> Dict:
+    """Return the same series as stats.chart_series, summed in the database from matching cube cells."""
+    cells = cube_cells(cleaned_data)
+    voted = {f"voted_{flag}": F("flags").bitand(flag_bit(flag)) for flag in ELECTION_FLAGS}
+    sums = cells.alias(**voted).aggregate(
+        total=Sum("count"),
+        score_sum=Sum(F("voter_score") * F("count")),
+        **{flag: Sum("count", filter=Q(**{f"voted_{flag}": flag_bit(flag)})) for flag in ELECTION_FLAGS},
+    )
+    total = sums["total"] or 0
+    years = (
+        cells.exclude(birth_year=None).values_list("birth_year")
+        .annotate(n=Sum("count")).order_by("birth_year")
+    )
+    parties = cells.values_list("party").annotate(n=Sum("count")).order_by("-n", "party")
+    return {
+        "total": total,
+        "average_score": (sums["score_sum"] or 0) / total if total else 0.0,
+        "birth_years": list(years),
+        "parties": list(parties),
+        "elections": [(label, sums[flag] or 0) for flag, label in ELECTIONS],
+    }
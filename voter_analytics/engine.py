@@ -0,0 +1,174 @@
+"""
+File: voter_analytics/engine.py
+Author: kwabena <kwabena@bu.edu>
+Description: Optional in-process columnar query engine for voter filtering. Keeps
+the columns VoterFilterForm filters on as NumPy arrays (party codes, int16 birth
+year, int8 score, election flags packed into a uint8 bitmask) in list order, and
+answers counts, chart series and page id lists with vectorized masks. The ORM
+is only used to fetch the rows shown on a page.
+
+Enabled with VOTER_ANALYTICS_ENGINE = True when NumPy is installed. The columns
+are reloaded whenever the data generation changes, i.e. after every import,
+preferably by memory-mapping the import's snapshot (see snapshot.py) so worker
+processes share one copy.
+
+Reference: NumPy boolean array indexing - https://numpy.org/doc/stable/user/basics.indexing.html#boolean-array-indexing
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from .metadata import current_generation
+from .models import ELECTIONS, ELECTION_FLAGS, Voter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; views fall back to the ORM
+    np = None
+
+
+class VoterColumns:
+    """Column arrays for every voter, ordered like the voter list."""
+
+    def __init__(self, generation: int, ids, party_codes, parties: List[str], birth_year, score, flags,
+                 mapped: bool = False):
+        self.generation = generation
+        # True when the arrays are memory-mapped from a shared snapshot
+        self.mapped = mapped
+        self.ids = ids
+        self.party_codes = party_codes
+        self.parties = parties
+        self.birth_year = birth_year
+        self.score = score
+        self.flags = flags
+
+    @classmethod
+    def from_database(cls, generation: int) -> "VoterColumns":
+        """Read the filter columns of every voter in (last_name, first_name, id) order."""
+        rows = (
+            Voter.objects.order_by("last_name", "first_name", "id")
+            .values_list("id", "party", "birth_year", "voter_score", *ELECTION_FLAGS)
+            .iterator(chunk_size=20000)
+        )
+        ids, parties, years, scores, flags = [], [], [], [], []
+        party_index = {}
+        for pk, party, birth_year, score, *votes in rows:
+            ids.append(pk)
+            parties.append(party_index.setdefault(party, len(party_index)))
+            years.append(birth_year or 0)
+            scores.append(score)
+            flags.append(sum(1 << i for i, voted in enumerate(votes) if voted))
+        return cls(
+            generation,
+            np.array(ids, dtype=np.int64),
+            np.array(parties, dtype=np.uint8),
+            list(party_index),
+            np.array(years, dtype=np.int16),
+            np.array(scores, dtype=np.int8),
+            np.array(flags, dtype=np.uint8),
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mask(self, cleaned_data: Dict):
+        """Evaluate VoterFilterForm data as a boolean mask (same predicates as _filtered_queryset)."""
+        mask = np.ones(len(self.ids), dtype=bool)
+        party = cleaned_data.get("party")
+        if party:
+            if party not in self.parties:
+                return np.zeros(len(self.ids), dtype=bool)
+            mask &= self.party_codes == self.parties.index(party)
+        min_year = cleaned_data.get("dob_min_year")
+        max_year = cleaned_data.get("dob_max_year")
+        if min_year:
+            mask &= self.birth_year >= int(min_year)
+        if max_year:
+            mask &= self.birth_year <= int(max_year)
+        score = cleaned_data.get("voter_score")
+        if score not in (None, ""):
+            mask &= self.score == int(score)
+        required = sum(1 << i for i, flag in enumerate(ELECTION_FLAGS) if cleaned_data.get(flag))
+        if required:
+            mask &= (self.flags & required) == required
+        return mask
+
+    def count(self, cleaned_data: Dict) -> int:
+        return int(np.count_nonzero(self.mask(cleaned_data)))
+
+    def matching_ids(self, cleaned_data: Dict):
+        """Return the ids of matching voters in list order."""
+        return self.ids[self.mask(cleaned_data)]
+
+    def series(self, cleaned_data: Dict) -> Dict:
+        """Return the same series as stats.chart_series for the matching voters."""
+        mask = self.mask(cleaned_data)
+        total = int(np.count_nonzero(mask))
+        if not total:
+            return {
+                "total": 0,
+                "average_score": 0.0,
+                "birth_years": [],
+                "parties": [],
+                "elections": [(label, 0) for _, label in ELECTIONS],
+            }
+        years = self.birth_year[mask]
+        first_year = int(years.min())
+        year_counts = np.bincount(years - first_year)
+        party_counts = np.bincount(self.party_codes[mask], minlength=len(self.parties))
+        flags = self.flags[mask]
+        parties = [(self.parties[i], int(n)) for i, n in enumerate(party_counts) if n]
+        return {
+            "total": total,
+            "average_score": float(self.score[mask].mean()),
+            "birth_years": [(first_year + i, int(n)) for i, n in enumerate(year_counts) if n],
+            "parties": sorted(parties, key=lambda item: (-item[1], item[0])),
+            "elections": [
+                (label, int(np.count_nonzero(flags & (1 << i)))) for i, (_, label) in enumerate(ELECTIONS)
+            ],
+        }
+
+
+_columns: Optional[VoterColumns] = None
+_lock = threading.Lock()
+
+
+def engine_enabled() -> bool:
+    """Whether VOTER_ANALYTICS_ENGINE is on and NumPy is importable."""
+    return np is not None and getattr(settings, "VOTER_ANALYTICS_ENGINE", False)
+
+
+def get_engine() -> Optional[VoterColumns]:
+    """
+    Return the loaded columns, reloading them if an import has changed the data
+    generation. A matching snapshot is memory-mapped; otherwise the columns are
+    read from the database into this process, and swapped for the snapshot as
+    soon as the import publishes it (it is written after the generation moves).
+    """
+    global _columns
+    if not engine_enabled():
+        return None
+    from .snapshot import load_snapshot, snapshot_published
+
+    generation = current_generation()
+    if _columns is None or _columns.generation != generation:
+        with _lock:
+            if _columns is None or _columns.generation != generation:
+                columns = load_snapshot(generation)
+                if columns is None:
+                    columns = VoterColumns.from_database(generation)
+                _columns = columns
+    elif not _columns.mapped and snapshot_published(generation):
+        with _lock:
+            if not _columns.mapped:
+                _columns = load_snapshot(generation) or _columns
+    return _columns
+
+
+def reset_engine():
+    """Drop the loaded columns; the next get_engine call reloads them."""
+    global _columns
+    with _lock:
+        _columns = None
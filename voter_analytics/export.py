@@ -0,0 +1,68 @@
+"""
+File: voter_analytics/export.py
+Author: kwabena <kwabena@bu.edu>
+Description: Streaming CSV and NDJSON export of filtered voters. Rows are read
+with values_list().iterator(chunk_size=...) so no model instances are built and
+only one chunk is held in memory, and the output is produced as a generator of
+text blocks that StreamingHttpResponse or a file can consume as it goes.
+
+References:
+- Django streaming large CSV files: https://docs.djangoproject.com/en/stable/howto/outputting-csv/#streaming-large-csv-files
+- QuerySet.iterator: https://docs.djangoproject.com/en/stable/ref/models/querysets/#iterator
+- NDJSON: https://github.com/ndjson/ndjson-spec
+"""
+
+import csv
+import json
+from itertools import islice
+from typing import Iterator
+
+from django.db.models import QuerySet
+
+from .models import CONTENT_FIELDS
+
+EXPORT_FIELDS = ("id",) + CONTENT_FIELDS + ("birth_year",)
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() returns the value, so csv.writer can format single rows."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_line(writer, row) -> str:
+    return writer.writerow(row)
+
+
+def _ndjson_line(row) -> str:
+    return json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str, separators=(",", ":")) + "\n"
+
+
+def export_lines(qs: QuerySet, fmt: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the voters in `qs` as `fmt` ("csv" or "ndjson"), ordered by id.
+
+    The CSV header is yielded on its own so clients get bytes before the first
+    query finishes; after that each yielded block holds up to `chunk_size` rows.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+    if fmt == "csv":
+        writer = csv.writer(Echo())
+        yield _csv_line(writer, EXPORT_FIELDS)
+        format_row = lambda row: _csv_line(writer, row)  # noqa: E731
+    else:
+        format_row = _ndjson_line
+
+    rows = qs.order_by("id").values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    while True:
+        block = "".join(format_row(row) for row in islice(rows, chunk_size))
+        if not block:
+            return
+        yield block
@@ -0,0 +1,629 @@
+"""
+File: voter_analytics/importer.py
+Author: kwabena <kwabena@bu.edu>
+Description: Bulk import engine for voter CSV files. Streams CSV rows into
+batched inserts, each committed in its own transaction, instead of one INSERT
+and one autocommit per row. Parsing can optionally be spread across a
+process pool, with the CSV split into byte ranges on line boundaries. An
+incremental mode diffs the file against the table by voter_key and row_hash and
+only writes new, changed and (optionally) departed voters. Parsers hand back
+rows already converted to column values, which are inserted with executemany
+without building model instances. Bad lines go to a
+reject CSV rather than aborting the load, and a checkpoint committed with each
+batch lets an interrupted import resume from the last byte offset it reached.
+
+References:
+- Django bulk_update: https://docs.djangoproject.com/en/stable/ref/models/querysets/#bulk-update
+- DB-API executemany: https://peps.python.org/pep-0249/#executemany
+- Django transactions: https://docs.djangoproject.com/en/stable/topics/db/transactions/
+- Django SchemaEditor: https://docs.djangoproject.com/en/stable/ref/schema-editor/
+- ProcessPoolExecutor: https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+"""
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import django
+from django.db import DatabaseError, connection, connections, transaction
+
+from .cube import rebuild_cube
+from .engine import reset_engine
+from .metadata import bump_generation
+from .precincts import rebuild_precinct_stats, refresh_precincts
+from .sampling import rebuild_sample, refresh_sample
+from .search import drop_search_triggers, rebuild_search_index
+from .snapshot import publish_snapshot
+from .models import (
+    CONTENT_FIELDS, VOTER_FIELDS, ImportCheckpoint, Voter,
+    parse_voter_row, validate_voter_values, voter_from_values,
+)
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+# Columns parse_voter_row needs; "Voter ID Number" is optional
+REQUIRED_COLUMNS = (
+    "Last Name", "First Name", "Residential Address - Street Number", "Residential Address - Street Name",
+    "Residential Address - Apartment Number", "Residential Address - Zip Code", "Date of Birth",
+    "Date of Registration", "Party Affiliation", "Precinct Number",
+    "v20state", "v21town", "v21primary", "v22general", "v23town", "voter_score",
+)
+
+
+class ImportAborted(Exception):
+    """Raised when an import rejects more lines than its max_rejects limit."""
+
+
+class ImportStats:
+    """Running totals for a single import, passed to progress callbacks."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.rejected = 0
+        # Precincts whose voters were added, changed or removed (incremental imports)
+        self.precincts = set()
+        # Byte offset a resumed import continued from (0 for a fresh import)
+        self.resumed_from = 0
+        self.rejects_path = ""
+        # Set when delete_missing was skipped because a rejected line had no readable key
+        self.skipped_delete = False
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+def default_csv_path() -> str:
+    """Return voter_analytics/data/newton_voters.csv next to this app."""
+    app_dir = Path(__file__).resolve().parent
+    return os.path.join(app_dir, "data", "newton_voters.csv")
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of at most `size` items from `items`."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ParsedLine(NamedTuple):
+    """
+    One line of the CSV: its byte range and either its column values, ready
+    to insert, or its raw bytes and why it was rejected.
+    """
+    start: int
+    end: int
+    raw: Optional[bytes]
+    values: Optional[tuple]
+    error: str = ""
+    # Voter ID Number of a rejected line, when it can still be read
+    key: str = ""
+
+
+def read_header(csv_path: str) -> Tuple[List[str], int]:
+    """Return the CSV's field names and the byte offset of its first data line."""
+    with open(csv_path, "rb") as fh:
+        header = fh.readline()
+    fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+    missing = [column for column in REQUIRED_COLUMNS if column not in fieldnames]
+    if missing:
+        raise ValueError(f"{csv_path} is missing required columns: {', '.join(missing)}")
+    return fieldnames, len(header)
+
+
+def parse_line(line: bytes, fieldnames: List[str]) -> tuple:
+    """Parse one raw CSV line into a voter tuple; raises ValueError (or csv.Error) if it is malformed."""
+    fields = next(csv.reader([line.decode("utf-8")]))
+    if len(fields) != len(fieldnames):
+        raise ValueError(f"expected {len(fieldnames)} fields, found {len(fields)}")
+    values = parse_voter_row(dict(zip(fieldnames, fields)))
+    validate_voter_values(values)
+    return values
+
+
+_VOTER_COLUMNS = [Voter._meta.get_field(name) for name in VOTER_FIELDS]
+KEY_INDEX = VOTER_FIELDS.index("voter_key")
+HASH_INDEX = VOTER_FIELDS.index("row_hash")
+PRECINCT_INDEX = VOTER_FIELDS.index("precinct")
+
+
+def db_values(values: tuple) -> tuple:
+    """Convert a parse_voter_row tuple to the values stored in the VOTER_FIELDS columns."""
+    return tuple(field.get_db_prep_save(value, connection) for field, value in zip(_VOTER_COLUMNS, values))
+
+
+def _parse_range(fh, start: int, end: int, fieldnames: List[str]) -> Iterator[ParsedLine]:
+    """
+    Yield a ParsedLine for every non-blank line between two byte offsets of an
+    open file. Only rejected lines carry their raw bytes, which keeps what the
+    parser processes send back small.
+    """
+    fh.seek(start)
+    offset = start
+    while offset < end:
+        line = fh.readline()
+        if not line:
+            break
+        line_start, offset = offset, offset + len(line)
+        if not line.strip():
+            continue
+        try:
+            yield ParsedLine(line_start, offset, None, db_values(parse_line(line, fieldnames)))
+        except (ValueError, TypeError, UnicodeDecodeError, csv.Error) as exc:
+            yield ParsedLine(line_start, offset, line, None, str(exc) or type(exc).__name__, _salvage_key(line, fieldnames))
+
+
+def _salvage_key(line: bytes, fieldnames: List[str]) -> str:
+    """Best-effort Voter ID Number of a malformed line, so --delete-missing does not treat it as departed."""
+    try:
+        fields = next(csv.reader([line.decode("utf-8", errors="replace")]))
+    except csv.Error:
+        return ""
+    return (dict(zip(fieldnames, fields)).get("Voter ID Number") or "").strip()
+
+
+def _serial_lines(csv_path: str, fieldnames: List[str], start: int) -> Iterator[ParsedLine]:
+    """Yield ParsedLines from byte offset `start` to the end of the file, in this process."""
+    with open(csv_path, "rb") as fh:
+        yield from _parse_range(fh, start, os.fstat(fh.fileno()).st_size, fieldnames)
+
+
+def split_csv(csv_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Split a CSV file from byte offset `start` into byte ranges that start and
+    end on line boundaries.
+
+    Assumes no quoted field contains a newline, which holds for the voter
+    files. Returns the (start, end) offsets of each chunk.
+    """
+    with open(csv_path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        ranges = []
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                fh.seek(end)
+                fh.readline()
+                end = fh.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_chunk(csv_path: str, start: int, end: int, fieldnames: List[str]) -> List[ParsedLine]:
+    """Parse the lines between two byte offsets (runs in a worker process)."""
+    with open(csv_path, "rb") as fh:
+        return list(_parse_range(fh, start, end, fieldnames))
+
+
+def _parallel_lines(csv_path: str, fieldnames: List[str], start: int, workers: int,
+                    chunk_bytes: int) -> Iterator[ParsedLine]:
+    """
+    Yield ParsedLines in file order, parsing chunks in a process pool.
+
+    At most two chunks per worker are in flight so memory stays bounded
+    when the database writer is slower than the parsers.
+    """
+    ranges = split_csv(csv_path, chunk_bytes, start)
+    # Children must not inherit an open database connection
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        pending = deque()
+        for chunk_start, chunk_end in ranges:
+            pending.append(pool.submit(parse_chunk, csv_path, chunk_start, chunk_end, fieldnames))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class RejectWriter:
+    """
+    Append rejected lines, with their byte offset and the reason, to a CSV file.
+
+    The file is created on the first reject. When resuming, an existing file
+    is cut back to `keep_bytes`, the size recorded with the checkpoint, so
+    rejects from batches that never committed are not written twice.
+    """
+
+    FIELDS = ("offset", "reason", "line")
+
+    def __init__(self, path: str, keep_bytes: int = 0):
+        self.path = path
+        self.keep_bytes = keep_bytes
+        self._fh = None
+        self._writer = None
+
+    def write(self, line: ParsedLine, raw: bytes):
+        if self._fh is None:
+            self._open()
+        text = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        self._writer.writerow((line.start, line.error, text))
+
+    def _open(self):
+        if self.keep_bytes and os.path.exists(self.path):
+            self._fh = open(self.path, "r+", newline="", encoding="utf-8")
+            self._fh.truncate(self.keep_bytes)
+            self._fh.seek(self.keep_bytes)
+            self._writer = csv.writer(self._fh)
+        else:
+            self._fh = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._fh)
+            self._writer.writerow(self.FIELDS)
+
+    def flush(self) -> int:
+        """Flush to disk and return the file size to record in the checkpoint."""
+        if self._fh is None:
+            return self.keep_bytes
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        return os.fstat(self._fh.fileno()).st_size
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+
+
+def _existing_index_names() -> set:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, Voter._meta.db_table)
+    return {name for name, info in constraints.items() if info.get("index")}
+
+
+def drop_indexes():
+    """Drop the Meta.indexes of Voter so a reload does not maintain them row by row."""
+    existing = _existing_index_names()
+    with connection.schema_editor() as editor:
+        for index in Voter._meta.indexes:
+            if index.name in existing:
+                editor.remove_index(Voter, index)
+
+
+def rebuild_indexes():
+    """Recreate any Meta.indexes of Voter that are missing from the database."""
+    existing = _existing_index_names()
+    with connection.schema_editor() as editor:
+        for index in Voter._meta.indexes:
+            if index.name not in existing:
+                editor.add_index(Voter, index)
+
+
+def fast_delete(queryset) -> int:
+    """
+    Delete rows with a single SQL DELETE. QuerySet.delete() would load every
+    voter to send the per-object signals that keep PrecinctStats current, which
+    bulk imports do not need since they refresh the touched precincts themselves.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def _existing_keys() -> dict:
+    """Map voter_key to (pk, row_hash) for every keyed voter already stored."""
+    rows = Voter.objects.exclude(voter_key=None).values_list("voter_key", "pk", "row_hash")
+    return {key: (pk, row_hash) for key, pk, row_hash in rows.iterator(chunk_size=10000)}
+
+
+def _plan_incremental(lines: List[ParsedLine], existing: dict, seen: set, stats: ImportStats) -> List[tuple]:
+    """Return (line, pk) for the new (pk None) and changed voters in one batch of parsed lines."""
+    planned = []
+    for line in lines:
+        key = line.values[KEY_INDEX]
+        if key in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        current = existing.pop(key, None)
+        if current is None:
+            planned.append((line, None))
+        elif current[1] != line.values[HASH_INDEX]:
+            planned.append((line, current[0]))
+        else:
+            stats.unchanged += 1
+    return planned
+
+
+def _plan_append(lines: List[ParsedLine], seen: set, stats: ImportStats) -> List[tuple]:
+    """
+    Return (line, None) for the voters of one batch that are not stored yet.
+
+    Keys repeated in the file or already in the table (one voter_key__in query
+    per batch) are counted as duplicates up front, so the unique constraint
+    only catches genuinely bad rows and _write_isolating rarely has to split.
+    """
+    keys = [line.values[KEY_INDEX] for line in lines]
+    stored = set(Voter.objects.filter(voter_key__in=[key for key in keys if key]).values_list("voter_key", flat=True))
+    planned = []
+    for line, key in zip(lines, keys):
+        if key is not None and (key in seen or key in stored):
+            stats.duplicates += 1
+            continue
+        if key is not None:
+            seen.add(key)
+        planned.append((line, None))
+    return planned
+
+
+def _insert_rows(rows: List[tuple], batch_size: int):
+    """INSERT VOTER_FIELDS column values with executemany, `batch_size` rows per call."""
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(Voter._meta.db_table),
+        ", ".join(quote(field.column) for field in _VOTER_COLUMNS),
+        ", ".join(["%s"] * len(_VOTER_COLUMNS)),
+    )
+    with connection.cursor() as cursor:
+        for rows_batch in _batched(rows, batch_size):
+            cursor.executemany(sql, rows_batch)
+
+
+def _write_voters(planned: List[tuple], stats: ImportStats, batch_size: int):
+    """
+    Insert and update the planned voters; counts are only added once the writes succeed.
+
+    New rows go straight from their column values to executemany; Voter
+    instances are only built for the changed rows bulk_update writes.
+    """
+    to_create = [line.values for line, pk in planned if pk is None]
+    to_update = []
+    for line, pk in planned:
+        if pk is not None:
+            voter = voter_from_values(line.values)
+            voter.pk = pk
+            to_update.append(voter)
+    precincts = {line.values[PRECINCT_INDEX] for line, _ in planned}
+    if to_update:
+        # A changed voter may have moved out of their old precinct
+        old = Voter.objects.filter(pk__in=[voter.pk for voter in to_update])
+        precincts.update(old.values_list("precinct", flat=True).distinct())
+    _insert_rows(to_create, batch_size)
+    Voter.objects.bulk_update(to_update, CONTENT_FIELDS + ("row_hash",), batch_size=batch_size)
+    stats.created += len(to_create)
+    stats.updated += len(to_update)
+    stats.precincts.update(precincts)
+
+
+def _write_isolating(planned: List[tuple], stats: ImportStats, batch_size: int, reject: Callable):
+    """
+    Write the planned voters in a savepoint. If the database refuses the
+    batch (e.g. a duplicate voter_key), split it in halves until the failing
+    rows are isolated, and reject just those.
+    """
+    if not planned:
+        return
+    try:
+        with transaction.atomic():
+            _write_voters(planned, stats, batch_size)
+    except DatabaseError as exc:
+        if len(planned) == 1:
+            line = planned[0][0]
+            reject(line._replace(error=f"database error: {exc}"))
+            return
+        middle = len(planned) // 2
+        _write_isolating(planned[:middle], stats, batch_size, reject)
+        _write_isolating(planned[middle:], stats, batch_size, reject)
+
+
+def _replay_keys(csv_path: str, fieldnames: List[str], start: int, end: int, existing: dict, seen: set) -> bool:
+    """
+    Mark the voter keys of already-committed lines as seen, so a resumed
+    delete_missing keeps those voters. Returns whether any line had no key.
+    """
+    unkeyed = False
+    with open(csv_path, "rb") as fh:
+        for line in _parse_range(fh, start, end, fieldnames):
+            key = _line_key(line)
+            unkeyed = unkeyed or not key
+            existing.pop(key, None)
+            if line.values is not None:
+                seen.add(key)
+    return unkeyed
+
+
+def _read_range(csv_path: str, start: int, end: int) -> bytes:
+    """Read the bytes of one line back from the file, for a parsed line the database refused."""
+    with open(csv_path, "rb") as fh:
+        fh.seek(start)
+        return fh.read(end - start)
+
+
+def _line_key(line: ParsedLine) -> str:
+    return line.values[KEY_INDEX] if line.values is not None else line.key
+
+
+def bulk_import(
+    csv_path: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    wipe: bool = False,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+    workers: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    incremental: bool = False,
+    delete_missing: bool = False,
+    rejects_path: Optional[str] = None,
+    max_rejects: Optional[int] = None,
+    resume: bool = False,
+) -> ImportStats:
+    """
+    Load Voter rows from a CSV file using batched, transactional bulk inserts.
+
+    Malformed lines, and rows the database refuses, are written to a reject
+    CSV with the reason instead of aborting the import. Rows whose voter_key is
+    already stored, or repeats an earlier line, are skipped as duplicates
+    (incremental imports update changed ones instead). After each committed
+    batch an ImportCheckpoint records the byte offset reached, in the same
+    transaction, so an interrupted import can be resumed from there.
+
+    Args:
+        csv_path: CSV file to load; defaults to the bundled Newton voter file
+        batch_size: number of rows inserted and committed together
+        wipe: delete all existing voters first and drop/rebuild the Voter
+            indexes and search index around the load; other imports keep
+            the search index current through its triggers
+        progress: optional callable invoked with the running stats after
+            each committed batch
+        workers: number of parser processes; 1 parses in this process
+        chunk_bytes: approximate size of each byte range handed to a worker
+        incremental: insert only new voters and update only changed ones,
+            matching rows to stored voters by voter_key and row_hash; refused
+            while any stored voter has no voter_key
+        delete_missing: with incremental, also delete stored voters whose
+            key does not appear in the file
+        rejects_path: reject CSV (offset, reason, line); defaults to
+            <csv_path>.rejects.csv, created only if something is rejected
+        max_rejects: abort with ImportAborted once more lines than this are
+            rejected; None never aborts
+        resume: continue from the checkpoint an interrupted import of the
+            same file in the same mode left behind
+
+    Returns:
+        ImportStats: totals for the import
+    """
+    if csv_path is None:
+        csv_path = default_csv_path()
+
+    if incremental and wipe:
+        raise ValueError("incremental and wipe imports are mutually exclusive")
+    if incremental and Voter.objects.filter(voter_key=None).exists():
+        # Voters loaded before voter_key existed (or added outside the importer) cannot be
+        # matched to file rows; diffing would insert them again and never delete them
+        raise ValueError(
+            "Some stored voters have no voter_key, so an incremental import cannot match them; "
+            "reload the file once with a wipe import (import_voters --wipe) first"
+        )
+
+    source = os.path.abspath(csv_path)
+    mode = "wipe" if wipe else "incremental" if incremental else "append"
+    file_stat = os.stat(source)
+    fieldnames, header_end = read_header(source)
+    offset = header_end
+    stats = ImportStats()
+
+    checkpoint = ImportCheckpoint.objects.filter(source=source).first()
+    if checkpoint is not None and resume:
+        if checkpoint.mode != mode:
+            raise ValueError(
+                f"The checkpoint for {source} is for a {checkpoint.mode} import, not {mode}; "
+                f"resume with the same options or rerun without resume to start over"
+            )
+        if (checkpoint.file_size, checkpoint.file_mtime) != (file_stat.st_size, file_stat.st_mtime):
+            raise ValueError(
+                f"{source} has changed since the checkpoint was written; rerun without resume to start over"
+            )
+        stats.resumed_from = offset = checkpoint.offset
+        for name in ("rows", "created", "updated", "unchanged", "duplicates", "rejected"):
+            setattr(stats, name, getattr(checkpoint, name))
+        rejects = RejectWriter(checkpoint.rejects_path, keep_bytes=checkpoint.rejects_bytes)
+    else:
+        if checkpoint is not None:
+            checkpoint.delete()
+        checkpoint = None
+        rejects = RejectWriter(rejects_path or f"{source}.rejects.csv")
+    stats.rejects_path = rejects.path
+
+    existing = _existing_keys() if incremental else None
+    seen = set()
+    if wipe:
+        drop_search_triggers()
+        if checkpoint is None:
+            fast_delete(Voter.objects.all())
+        drop_indexes()
+    unkeyed_rejects = False
+    if existing is not None and stats.resumed_from:
+        unkeyed_rejects = _replay_keys(source, fieldnames, header_end, offset, existing, seen)
+
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint.objects.create(
+            source=source, mode=mode, file_size=file_stat.st_size, file_mtime=file_stat.st_mtime,
+            offset=offset, rejects_path=rejects.path,
+        )
+
+    if workers > 1:
+        lines = _parallel_lines(source, fieldnames, offset, workers, chunk_bytes)
+    else:
+        lines = _serial_lines(source, fieldnames, offset)
+
+    def reject(line: ParsedLine):
+        nonlocal unkeyed_rejects
+        rejects.write(line, line.raw if line.raw is not None else _read_range(source, line.start, line.end))
+        stats.rejected += 1
+        unkeyed_rejects = unkeyed_rejects or not _line_key(line)
+
+    try:
+        for batch in _batched(lines, batch_size):
+            parsed = []
+            for line in batch:
+                if line.values is None:
+                    reject(line)
+                    if existing is not None:
+                        existing.pop(line.key, None)
+                else:
+                    parsed.append(line)
+            if max_rejects is not None and stats.rejected > max_rejects:
+                raise ImportAborted(f"{stats.rejected} lines rejected, more than the limit of {max_rejects}; see {rejects.path}")
+
+            if incremental:
+                planned = _plan_incremental(parsed, existing, seen, stats)
+            else:
+                planned = _plan_append(parsed, seen, stats)
+            with transaction.atomic():
+                _write_isolating(planned, stats, batch_size, reject)
+                stats.rows += len(batch)
+                ImportCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                    offset=batch[-1].end, rows=stats.rows, created=stats.created, updated=stats.updated,
+                    unchanged=stats.unchanged, duplicates=stats.duplicates, rejected=stats.rejected,
+                    rejects_bytes=rejects.flush(),
+                )
+            stats.batches += 1
+            if progress:
+                progress(stats)
+
+        if delete_missing and existing and unkeyed_rejects:
+            # A rejected line without a readable key may be any of the stored voters
+            stats.skipped_delete = True
+        elif delete_missing and existing:
+            departed = [pk for pk, _ in existing.values()]
+            for pks in _batched(departed, batch_size):
+                with transaction.atomic():
+                    departing = Voter.objects.filter(pk__in=pks)
+                    stats.precincts.update(departing.values_list("precinct", flat=True).distinct())
+                    stats.deleted += fast_delete(departing)
+    finally:
+        rejects.close()
+        if wipe:
+            rebuild_indexes()
+            rebuild_search_index()
+
+    rebuild_cube()
+    if incremental and not stats.resumed_from:
+        refresh_precincts(stats.precincts)
+        refresh_sample(stats.precincts)
+    else:
+        # A resumed import does not know which precincts the first attempt touched
+        rebuild_precinct_stats()
+        rebuild_sample()
+    bump_generation(csv_path, rows=stats.rows, created=stats.created, updated=stats.updated, deleted=stats.deleted)
+    ImportCheckpoint.objects.filter(pk=checkpoint.pk).delete()
+    publish_snapshot()
+    reset_engine()
+    return stats
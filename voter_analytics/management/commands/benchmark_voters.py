@@ -0,0 +1,166 @@
+"""
+File: voter_analytics/management/commands/benchmark_voters.py
+Author: kwabena <kwabena@bu.edu>
+Description: Management command that benchmarks the voter analytics app: the CSV
+load, VoterListView first and deep pages, each filter type and GraphsView. Records
+wall time and query counts per scenario as JSON so runs can be compared.
+
+Usage:
+    python manage.py benchmark_voters --csv voters_100k.csv --out bench_100k.json
+    python manage.py benchmark_voters --skip-load --repeat 5
+"""
+
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from voter_analytics.importer import fast_delete
+from voter_analytics.metadata import filter_metadata
+from voter_analytics.models import ELECTION_FLAGS, Voter, load_data
+from voter_analytics.pagination import encode_cursor
+from voter_analytics.response_cache import response_cache
+
+
+def _time_request(client: Client, url: str, repeat: int) -> dict:
+    """
+    GET `url` `repeat` times cold and warm; report median/min wall time and the query counts.
+
+    Each cold request runs after the response and Django caches are cleared, so
+    it measures the view itself; the warm request repeats it straight after and
+    shows what a cache hit costs.
+    """
+    cold, warm = [], []
+    queries = warm_queries = 0
+    status = None
+    for _ in range(repeat):
+        response_cache.clear()
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            cold.append(time.perf_counter() - started)
+        queries = len(captured)
+        status = response.status_code
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            client.get(url)
+            warm.append(time.perf_counter() - started)
+        warm_queries = len(captured)
+    return {
+        "url": url,
+        "status": status,
+        "queries": queries,
+        "median_ms": round(statistics.median(cold) * 1000, 2),
+        "min_ms": round(min(cold) * 1000, 2),
+        "warm_queries": warm_queries,
+        "warm_median_ms": round(statistics.median(warm) * 1000, 2),
+    }
+
+
+def scenarios():
+    """Return (name, url) pairs covering the list, deep pages, each filter type and graphs."""
+    list_url = reverse("voter_analytics:voters")
+    graphs_url = reverse("voter_analytics:graphs")
+    meta = filter_metadata()
+    total = meta["total_count"]
+    party = meta["party_choices"][0] if meta["party_choices"] else ""
+    years = meta["year_choices"]
+    mid_year = years[len(years) // 2] if years else 1970
+
+    urls = [
+        ("list_first_page", list_url),
+        ("list_filter_party", f"{list_url}?party={party}"),
+        ("list_filter_dob_range", f"{list_url}?dob_min_year={mid_year - 10}&dob_max_year={mid_year + 10}"),
+        ("list_filter_score", f"{list_url}?voter_score=3"),
+    ]
+    urls += [(f"list_filter_{flag}", f"{list_url}?{flag}=on") for flag in ELECTION_FLAGS]
+    urls.append(("list_filter_combined", f"{list_url}?party={party}&voter_score=3&v20state=on&v22general=on"))
+
+    if total >= 200:
+        deep_offset = (total // 100 - 1) * 100
+        urls.append(("list_deep_page_number", f"{list_url}?page={total // 100}"))
+        boundary = Voter.objects.order_by("last_name", "first_name", "id")[deep_offset - 1]
+        urls.append(("list_deep_page_cursor", f"{list_url}?after={encode_cursor(boundary)}"))
+
+    urls += [
+        ("graphs_all", graphs_url),
+        ("graphs_filter_party", f"{graphs_url}?party={party}"),
+        ("graphs_filter_combined", f"{graphs_url}?party={party}&dob_min_year={mid_year}&v21town=on"),
+        ("graphs_approx_all", f"{graphs_url}?mode=approx"),
+        ("graphs_approx_filter_party", f"{graphs_url}?party={party}&mode=approx"),
+    ]
+    return urls
+
+
+class Command(BaseCommand):
+    help = "Benchmark voter_analytics loading, list pages, filters and graphs; write results as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', default=None,
+                            help='CSV to load first with load_data (existing voters are deleted)')
+        parser.add_argument('--skip-load', action='store_true',
+                            help='Benchmark the voters already in the database')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Cold and warm requests per scenario; the medians are reported')
+        parser.add_argument('--label', default='',
+                            help='Free-form label stored with the results')
+        parser.add_argument('--out', default=None,
+                            help='Write JSON results to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        results = {
+            "label": options['label'],
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "pagination": getattr(settings, "VOTER_LIST_PAGINATION", "keyset"),
+                "count_mode": getattr(settings, "VOTER_LIST_COUNT_MODE", "exact"),
+                "cube": getattr(settings, "VOTER_ANALYTICS_USE_CUBE", True),
+                "engine": getattr(settings, "VOTER_ANALYTICS_ENGINE", False),
+            },
+            "scenarios": {},
+        }
+
+        if options['csv'] and not options['skip_load']:
+            fast_delete(Voter.objects.all())
+            started = time.perf_counter()
+            created = load_data(options['csv'])
+            elapsed = time.perf_counter() - started
+            results["load"] = {
+                "csv": options['csv'],
+                "rows": created,
+                "seconds": round(elapsed, 3),
+                "rows_per_sec": round(created / elapsed) if elapsed else None,
+            }
+            self.stderr.write(f"load_data: {created:,} rows in {elapsed:.1f}s")
+
+        results["voters"] = Voter.objects.count()
+        client = Client()
+        for name, url in scenarios():
+            result = _time_request(client, url, options['repeat'])
+            results["scenarios"][name] = result
+            self.stderr.write(
+                f"{name}: {result['median_ms']} ms cold, {result['queries']} queries; "
+                f"{result['warm_median_ms']} ms warm, {result['warm_queries']} queries"
+            )
+
+        output = json.dumps(results, indent=2)
+        if options['out']:
+            with open(options['out'], "w", encoding="utf-8") as fh:
+                fh.write(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['out']}"))
+        else:
+            self.stdout.write(output)
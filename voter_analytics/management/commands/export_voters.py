@@ -0,0 +1,57 @@
+"""
+File: voter_analytics/management/commands/export_voters.py
+Author: kwabena <kwabena@bu.edu>
+Description: Management command that streams the voters matching the
+VoterFilterForm filters to a CSV or NDJSON file (or stdout) in constant memory.
+
+Usage:
+    python manage.py export_voters --out voters.csv
+    python manage.py export_voters --format ndjson --party D --v20state --out dems.ndjson
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from voter_analytics.export import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_lines
+from voter_analytics.models import ELECTION_FLAGS
+from voter_analytics.views import filter_voters
+
+
+class Command(BaseCommand):
+    help = "Export filtered voters as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv',
+                            help='Output format')
+        parser.add_argument('--out', default=None,
+                            help='File to write (defaults to stdout)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round trip')
+        parser.add_argument('--party', default='', help='Party affiliation')
+        parser.add_argument('--dob-min-year', default='', help='Earliest birth year')
+        parser.add_argument('--dob-max-year', default='', help='Latest birth year')
+        parser.add_argument('--voter-score', default='', help='Voter score (0-5)')
+        for flag in ELECTION_FLAGS:
+            parser.add_argument(f'--{flag}', action='store_true', help=f'Voted in {flag}')
+
+    def handle(self, *args, **options):
+        data = {
+            field: options[field]
+            for field in ('party', 'dob_min_year', 'dob_max_year', 'voter_score')
+            if options[field]
+        }
+        data.update({flag: 'on' for flag in ELECTION_FLAGS if options[flag]})
+        qs, form, _ = filter_voters(data)
+        if form.is_bound and not form.is_valid():
+            raise CommandError(form.errors.as_text())
+
+        out = open(options['out'], 'w', encoding='utf-8', newline='') if options['out'] else sys.stdout
+        try:
+            for block in export_lines(qs, options['format'], chunk_size=options['chunk_size']):
+                out.write(block)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if options['out']:
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['out']}"))
@@ -0,0 +1,143 @@
+"""
+File: voter_analytics/management/commands/generate_voters.py
+Author: kwabena <kwabena@bu.edu>
+Description: Management command that writes synthetic voter CSV files in the
+Newton voter file layout, for exercising the importer and views at scale.
+Party mix, birth-year spread and election turnout roughly follow the real file;
+each voter has a turnout propensity, so election flags are correlated and
+voter_score is their sum.
+
+Usage:
+    python manage.py generate_voters --rows 100k [--out path.csv] [--seed N]
+    python manage.py generate_voters --sizes 10k,100k,1M,5M --out-dir data/
+"""
+
+import csv
+import os
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from voter_analytics.models import ELECTION_FLAGS
+
+HEADER = [
+    "Voter ID Number", "Last Name", "First Name",
+    "Residential Address - Street Number", "Residential Address - Street Name",
+    "Residential Address - Apartment Number", "Residential Address - Zip Code",
+    "Date of Birth", "Date of Registration", "Party Affiliation", "Precinct Number",
+    *ELECTION_FLAGS, "voter_score",
+]
+
+PARTIES = [("U ", 0.52), ("D ", 0.36), ("R ", 0.09), ("J ", 0.01), ("L ", 0.01), ("G ", 0.005), ("Q ", 0.005)]
+# Base turnout per election; state/general elections draw far more voters than town/primary ones
+TURNOUT = {"v20state": 0.85, "v21town": 0.35, "v21primary": 0.20, "v22general": 0.70, "v23town": 0.30}
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "Chen", "Kim", "Patel", "O'Brien", "Sullivan", "Murphy", "Kelly", "Cohen", "Goldberg", "Wong",
+]
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley",
+    "Wei", "Priya", "Kwabena", "Sofia", "Liam", "Olivia", "Noah", "Emma", "Aiden", "Mia",
+]
+STREETS = [
+    "Commonwealth Ave", "Beacon St", "Washington St", "Walnut St", "Centre St", "Chestnut St",
+    "Lowell Ave", "Watertown St", "Homer St", "Boylston St", "Dedham St", "Parker St", "Hammond St",
+    "Auburn St", "Grove St", "Lexington St", "California St", "Cabot St", "Crafts St", "Elm St",
+]
+ZIPCODES = ["02458", "02459", "02460", "02461", "02462", "02464", "02465", "02466", "02467", "02468"]
+PRECINCTS = [f"{ward}{letter}" for ward in range(1, 9) for letter in "ABCD"]
+
+
+def parse_size(value: str) -> int:
+    """Parse a row count such as 10000, 10k or 1M."""
+    text = value.strip().lower().replace("_", "").replace(",", "")
+    multiplier = 1
+    if text.endswith("k"):
+        multiplier, text = 1_000, text[:-1]
+    elif text.endswith("m"):
+        multiplier, text = 1_000_000, text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        raise CommandError(f"Invalid row count: {value}")
+
+
+def _birth_date(rng: random.Random) -> date:
+    # Adults born 1925-2005, weighted towards middle age
+    year = int(rng.triangular(1925, 2005, 1965))
+    return date(year, 1, 1) + timedelta(days=rng.randrange(365))
+
+
+def generate_rows(count: int, seed: int = 412):
+    """Yield `count` synthetic voter rows in HEADER order."""
+    rng = random.Random(seed)
+    party_codes = [code for code, _ in PARTIES]
+    party_weights = [weight for _, weight in PARTIES]
+    for n in range(count):
+        dob = _birth_date(rng)
+        earliest = date(dob.year + 18, dob.month, min(dob.day, 28))
+        registration = earliest + timedelta(days=rng.randrange(max(1, (date(2023, 1, 1) - earliest).days)))
+        # Per-voter propensity ties the five elections together
+        propensity = rng.betavariate(2, 2)
+        votes = [rng.random() < min(0.99, TURNOUT[flag] * 2 * propensity) for flag in ELECTION_FLAGS]
+        yield [
+            f"{n + 1:09d}",
+            rng.choice(LAST_NAMES),
+            rng.choice(FIRST_NAMES),
+            str(rng.randint(1, 400)),
+            rng.choice(STREETS).upper(),
+            str(rng.randint(1, 30)) if rng.random() < 0.3 else "",
+            rng.choice(ZIPCODES),
+            dob.isoformat(),
+            registration.isoformat(),
+            rng.choices(party_codes, party_weights)[0],
+            rng.choice(PRECINCTS),
+            *["TRUE" if voted else "FALSE" for voted in votes],
+            str(sum(votes)),
+        ]
+
+
+def write_csv(path: str, count: int, seed: int = 412):
+    """Write a synthetic voter file with `count` rows to `path`."""
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(HEADER)
+        writer.writerows(generate_rows(count, seed))
+
+
+class Command(BaseCommand):
+    help = "Write synthetic voter CSV files for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='10k',
+                            help='Number of rows, e.g. 10k, 100k, 1M, 5M')
+        parser.add_argument('--out', default=None,
+                            help='Output CSV path (defaults to voters_<rows>.csv)')
+        parser.add_argument('--sizes', default=None,
+                            help='Comma-separated sizes to write in one go, e.g. 10k,100k,1M,5M')
+        parser.add_argument('--out-dir', default='.',
+                            help='Directory for the files written with --sizes')
+        parser.add_argument('--seed', type=int, default=412,
+                            help='Random seed, so runs are reproducible')
+
+    def handle(self, *args, **options):
+        if options['sizes']:
+            os.makedirs(options['out_dir'], exist_ok=True)
+            targets = [
+                (parse_size(size), os.path.join(options['out_dir'], f"voters_{size.strip()}.csv"))
+                for size in options['sizes'].split(",")
+            ]
+        else:
+            targets = [(parse_size(options['rows']), options['out'] or f"voters_{options['rows']}.csv")]
+
+        for count, path in targets:
+            self.stdout.write(f"Writing {count:,} voters to {path}...")
+            write_csv(path, count, options['seed'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(targets)} file(s)"))
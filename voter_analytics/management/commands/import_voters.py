@@ -0,0 +1,104 @@
+"""
+File: voter_analytics/management/commands/import_voters.py
+Author: kwabena <kwabena@bu.edu>
+Description: Management command that loads a voter CSV file with the batched
+bulk import engine and reports progress and throughput.
+
+Usage:
+    python manage.py import_voters [csv_path] [--batch-size N] [--wipe] [--workers N]
+    python manage.py import_voters [csv_path] --incremental [--delete-missing]
+    python manage.py import_voters [csv_path] --rejects bad_rows.csv --max-rejects 1000
+    python manage.py import_voters [csv_path] --wipe --resume
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from voter_analytics.importer import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_BYTES, ImportAborted, bulk_import
+
+
+class Command(BaseCommand):
+    help = "Bulk load voters from a CSV file in batched transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', nargs='?', default=None,
+                            help='CSV file to load (defaults to voter_analytics/data/newton_voters.csv)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Rows inserted and committed per transaction')
+        parser.add_argument('--wipe', action='store_true',
+                            help='Delete all voters and drop/rebuild indexes around the load')
+        parser.add_argument('--incremental', action='store_true',
+                            help='Insert new and update changed voters only, matched by Voter ID Number')
+        parser.add_argument('--delete-missing', action='store_true',
+                            help='With --incremental, delete voters that are no longer in the file')
+        parser.add_argument('--workers', type=int, default=1,
+                            help=f'Parser processes; 0 uses every core ({os.cpu_count()} here)')
+        parser.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES,
+                            help='Size of the CSV byte ranges handed to each parser process')
+        parser.add_argument('--rejects', default=None,
+                            help='CSV for rejected lines with the reason (default: <csv_path>.rejects.csv)')
+        parser.add_argument('--max-rejects', type=int, default=None,
+                            help='Abort once more than this many lines are rejected (default: no limit)')
+        parser.add_argument('--resume', action='store_true',
+                            help='Continue an interrupted import of this file from its last checkpoint')
+
+    def handle(self, *args, **options):
+        if options['incremental'] and options['wipe']:
+            raise CommandError("--incremental and --wipe cannot be combined")
+        if options['delete_missing'] and not options['incremental']:
+            raise CommandError("--delete-missing requires --incremental")
+        if options['wipe']:
+            self.stdout.write("Wiping existing voters...")
+
+        try:
+            stats = bulk_import(
+                options['csv_path'],
+                batch_size=options['batch_size'],
+                wipe=options['wipe'],
+                progress=self._report,
+                workers=options['workers'] or os.cpu_count() or 1,
+                chunk_bytes=options['chunk_bytes'],
+                incremental=options['incremental'],
+                delete_missing=options['delete_missing'],
+                rejects_path=options['rejects'],
+                max_rejects=options['max_rejects'],
+                resume=options['resume'],
+            )
+        except (ImportAborted, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if stats.resumed_from:
+            self.stdout.write(f"Resumed from byte {stats.resumed_from:,}")
+
+        if options['incremental']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Diffed {stats.rows} rows in {stats.elapsed:.1f}s: {stats.created} new, "
+                f"{stats.updated} changed, {stats.unchanged} unchanged, {stats.deleted} deleted"
+            ))
+            if stats.duplicates:
+                self.stdout.write(self.style.WARNING(
+                    f"Skipped {stats.duplicates} rows repeating a Voter ID Number already seen in the file"
+                ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Imported {stats.created} voters in {stats.elapsed:.1f}s "
+                f"({stats.rows_per_sec:,.0f} rows/sec)"
+            ))
+            if stats.duplicates:
+                self.stdout.write(self.style.WARNING(
+                    f"Skipped {stats.duplicates} rows whose Voter ID Number was already stored or seen in the file"
+                ))
+        if stats.rejected:
+            self.stdout.write(self.style.WARNING(
+                f"Rejected {stats.rejected} lines; see {stats.rejects_path}"
+            ))
+        if stats.skipped_delete:
+            self.stdout.write(self.style.WARNING(
+                "Did not delete missing voters: a rejected line had no readable Voter ID Number"
+            ))
+
+    def _report(self, stats):
+        self.stdout.write(
+            f"  batch {stats.batches}: {stats.rows:,} rows, {stats.rows_per_sec:,.0f} rows/sec"
+        )
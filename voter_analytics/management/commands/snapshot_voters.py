@@ -0,0 +1,32 @@
+"""
+File: voter_analytics/management/commands/snapshot_voters.py
+Author: kwabena <kwabena@bu.edu>
+Description: Management command that writes a memory-mapped columnar snapshot of
+the current voter data for the web workers, e.g. after a first deploy.
+
+Usage:
+    python manage.py snapshot_voters
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from voter_analytics.engine import VoterColumns, np
+from voter_analytics.metadata import current_generation
+from voter_analytics.snapshot import snapshot_root, write_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write a versioned, memory-mappable snapshot of the voter columns"
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError("NumPy is required to write voter snapshots")
+        root = snapshot_root()
+        if not root:
+            raise CommandError("VOTER_SNAPSHOT_DIR is not set")
+
+        columns = VoterColumns.from_database(current_generation())
+        directory = write_snapshot(columns, root)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote snapshot of {len(columns)} voters (generation {columns.generation}) to {directory}"
+        ))
@@ -0,0 +1,26 @@
+"""
+File: voter_analytics/management/commands/vendor_plotlyjs.py
+Author: kwabena <kwabena@bu.edu>
+Description: Management command that copies the plotly.js bundle shipped with the
+installed plotly package into the app's static directory under a content-hashed
+name, so GraphsView serves it locally with immutable cache headers instead of
+loading it from the CDN. Run it at deploy, after installing requirements.
+
+Usage:
+    python manage.py vendor_plotlyjs
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from voter_analytics.charts import write_vendored_plotly
+
+
+class Command(BaseCommand):
+    help = "Vendor plotly.js from the installed plotly package as a content-hashed static file"
+
+    def handle(self, *args, **options):
+        try:
+            path = write_vendored_plotly()
+        except ImportError:
+            raise CommandError("plotly is not installed")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
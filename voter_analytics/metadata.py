@@ -0,0 +1,140 @@
+"""
+File: voter_analytics/metadata.py
+Author: kwabena <kwabena@bu.edu>
+Description: Data generation counter and cached filter metadata for the voter
+analytics views. Every import records an ImportRun; the newest run's pk is the
+generation, and cache keys that include it go stale as soon as data changes.
+
+References:
+- Django cache framework: https://docs.djangoproject.com/en/stable/topics/cache/
+- Django aggregation: https://docs.djangoproject.com/en/stable/topics/db/aggregation/
+"""
+
+from datetime import date
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+
+from .models import ELECTION_FLAGS, ImportRun, Voter
+
+METADATA_TIMEOUT = 24 * 60 * 60
+
+
+def current_generation() -> int:
+    """Return the data generation: the pk of the newest ImportRun, or 0."""
+    return ImportRun.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+def current_import() -> Optional[ImportRun]:
+    """Return the newest ImportRun (the current generation), or None before any import."""
+    return ImportRun.objects.order_by("-pk").first()
+
+
+def bump_generation(source: str = "", rows: int = 0, created: int = 0, updated: int = 0, deleted: int = 0) -> ImportRun:
+    """Record a completed import, which moves every generation-keyed cache entry out of use."""
+    return ImportRun.objects.create(
+        source=str(source)[:255], rows=rows, created=created, updated=updated, deleted=deleted
+    )
+
+
+def generation_key(name: str, generation: int = None) -> str:
+    """Build a cache key for `name` scoped to a data generation (the current one by default)."""
+    if generation is None:
+        generation = current_generation()
+    return f"voter_analytics:{generation}:{name}"
+
+
+def _compute_metadata() -> Dict:
+    parties = list(
+        Voter.objects.exclude(party="").values_list("party", flat=True).distinct().order_by("party")
+    )
+    bounds = Voter.objects.aggregate(min_year=Min("birth_year"), max_year=Max("birth_year"), total=Count("pk"))
+    if bounds["min_year"] and bounds["max_year"]:
+        year_choices = list(range(bounds["min_year"], bounds["max_year"] + 1))
+    else:
+        year_choices = []
+    scores = list(Voter.objects.values_list("voter_score", flat=True).distinct().order_by("voter_score"))
+    return {
+        "party_choices": parties,
+        "year_choices": year_choices,
+        "score_choices": [(str(s), str(s)) for s in scores],
+        "total_count": bounds["total"],
+    }
+
+
+def filter_metadata() -> Dict:
+    """
+    Return the choices for VoterFilterForm plus the total voter count.
+
+    Computed with DISTINCT/MIN/MAX/COUNT aggregates once per data generation
+    and kept in Django's cache, so list and graph requests skip the scans.
+    """
+    key = generation_key("filter_metadata")
+    meta = cache.get(key)
+    if meta is None:
+        meta = _compute_metadata()
+        cache.set(key, meta, METADATA_TIMEOUT)
+    return meta
+
+
+def _compute_column_stats() -> Dict:
+    flag_counts = Voter.objects.aggregate(
+        **{flag: Count("pk", filter=Q(**{flag: True})) for flag in ELECTION_FLAGS}
+    )
+    return {
+        "total": Voter.objects.count(),
+        "party": dict(Voter.objects.values_list("party").annotate(n=Count("pk")).order_by()),
+        "voter_score": dict(Voter.objects.values_list("voter_score").annotate(n=Count("pk")).order_by()),
+        "birth_year": dict(
+            Voter.objects.values_list("birth_year").annotate(n=Count("pk")).order_by()
+        ),
+        "flags": flag_counts,
+    }
+
+
+def column_stats() -> Dict:
+    """Return per-column value counts (party, score, birth year, election flags), cached per generation."""
+    key = generation_key("column_stats")
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute_column_stats()
+        cache.set(key, stats, METADATA_TIMEOUT)
+    return stats
+
+
+def estimate_count(cleaned_data: Dict) -> int:
+    """
+    Estimate how many voters match VoterFilterForm data without scanning Voter.
+
+    Multiplies the selectivity of each active filter, taken from the cached
+    column_stats, assuming the filters are independent (as a query planner
+    would). Exact when at most one filter is active.
+    """
+    stats = column_stats()
+    total = stats["total"]
+    if not total:
+        return 0
+    fraction = 1.0
+
+    party = cleaned_data.get("party")
+    if party:
+        fraction *= stats["party"].get(party, 0) / total
+
+    min_year = cleaned_data.get("dob_min_year")
+    max_year = cleaned_data.get("dob_max_year")
+    if min_year or max_year:
+        low = int(min_year) if min_year else date.min.year
+        high = int(max_year) if max_year else date.max.year
+        in_range = sum(n for year, n in stats["birth_year"].items() if year is not None and low <= year <= high)
+        fraction *= in_range / total
+
+    score = cleaned_data.get("voter_score")
+    if score not in (None, ""):
+        fraction *= stats["voter_score"].get(int(score), 0) / total
+
+    for flag in ELECTION_FLAGS:
+        if cleaned_data.get(flag):
+            fraction *= stats["flags"][flag] / total
+
+    return round(total * fraction)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voter',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='voter',
+            name='voter_key',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
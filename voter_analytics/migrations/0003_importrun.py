@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0002_voter_key_row_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('finished', models.DateTimeField(auto_now_add=True)),
+                ('source', models.CharField(blank=True, max_length=255)),
+                ('rows', models.IntegerField(default=0)),
+                ('created', models.IntegerField(default=0)),
+                ('updated', models.IntegerField(default=0)),
+                ('deleted', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
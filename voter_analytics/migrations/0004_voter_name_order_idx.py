@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0003_importrun'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='voter',
+            options={'ordering': ['last_name', 'first_name', 'id']},
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='voter_name_order_idx'),
+        ),
+    ]
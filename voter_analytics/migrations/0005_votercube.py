@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0004_voter_name_order_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoterCube',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('party', models.CharField(max_length=2)),
+                ('birth_year', models.IntegerField(null=True)),
+                ('voter_score', models.IntegerField()),
+                ('flags', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField()),
+            ],
+        ),
+    ]
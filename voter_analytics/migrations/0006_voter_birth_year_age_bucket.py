@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:07
+
+from datetime import date
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+from django.db.models.functions import ExtractYear
+
+# Mirrors voter_analytics.models.AGE_BUCKETS at the time of this migration
+AGE_BUCKETS = (
+    ("18-24", 18, 24),
+    ("25-34", 25, 34),
+    ("35-49", 35, 49),
+    ("50-64", 50, 64),
+    ("65+", 65, None),
+)
+
+
+def backfill_birth_year_age_bucket(apps, schema_editor):
+    """Fill birth_year and age_bucket for existing voters with two set-based UPDATEs."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    Voter.objects.update(birth_year=ExtractYear('dob'))
+    this_year = date.today().year
+    whens = []
+    for label, low, high in AGE_BUCKETS:
+        # age = this_year - birth_year, so an age range is a birth_year range
+        bounds = {'birth_year__lte': this_year - low}
+        if high is not None:
+            bounds['birth_year__gte'] = this_year - high
+        whens.append(When(then=Value(label), **bounds))
+    Voter.objects.update(age_bucket=Case(*whens, default=Value('')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0005_votercube'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voter',
+            name='age_bucket',
+            field=models.CharField(blank=True, default='', max_length=8),
+        ),
+        migrations.AddField(
+            model_name='voter',
+            name='birth_year',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_birth_year_age_bucket, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['birth_year'], name='voter_birth_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['age_bucket'], name='voter_age_bucket_idx'),
+        ),
+    ]
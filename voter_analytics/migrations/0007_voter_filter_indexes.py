@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0006_voter_birth_year_age_bucket'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['party', 'voter_score', 'birth_year'], name='voter_party_score_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['voter_score', 'birth_year'], name='voter_score_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v20state', True)), fields=['last_name', 'first_name', 'id'], name='voter_v20state_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v21town', True)), fields=['last_name', 'first_name', 'id'], name='voter_v21town_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v21primary', True)), fields=['last_name', 'first_name', 'id'], name='voter_v21primary_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v22general', True)), fields=['last_name', 'first_name', 'id'], name='voter_v22general_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v23town', True)), fields=['last_name', 'first_name', 'id'], name='voter_v23town_name_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:12
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Mirrors voter_analytics.search at the time of this migration
+FTS_TABLE = 'voter_analytics_voter_fts'
+COLUMNS = 'first_name, last_name, street_number, street_name, zipcode'
+NEW = ', '.join(f'new.{c}' for c in COLUMNS.split(', '))
+OLD = ', '.join(f'old.{c}' for c in COLUMNS.split(', '))
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS voter_fts_insert AFTER INSERT ON voter_analytics_voter BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS voter_fts_delete AFTER DELETE ON voter_analytics_voter BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS voter_fts_update AFTER UPDATE OF {COLUMNS} ON voter_analytics_voter BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END""",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """Create the FTS5 trigram index and its sync triggers; skipped where FTS5 trigram is unavailable."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({COLUMNS}, "
+                f"content='voter_analytics_voter', content_rowid='id', tokenize='trigram')"
+            )
+        except OperationalError:
+            # SQLite built without FTS5 or older than 3.34; search falls back to icontains
+            return
+        for sql in TRIGGERS:
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name in ('voter_fts_insert', 'voter_fts_delete', 'voter_fts_update'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0007_voter_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
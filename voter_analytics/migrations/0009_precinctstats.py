@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:15
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+ELECTION_FLAGS = ('v20state', 'v21town', 'v21primary', 'v22general', 'v23town')
+
+
+def build_precinct_stats(apps, schema_editor):
+    """Materialize PrecinctStats for the voters already loaded."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    PrecinctStats = apps.get_model('voter_analytics', 'PrecinctStats')
+    voters = Voter.objects.order_by()
+    parties = defaultdict(dict)
+    for precinct, party, n in voters.values_list('precinct', 'party').annotate(n=Count('pk')):
+        parties[precinct][party] = n
+    scores = defaultdict(dict)
+    for precinct, score, n in voters.values_list('precinct', 'voter_score').annotate(n=Count('pk')):
+        scores[precinct][str(score)] = n
+    totals = voters.values('precinct').annotate(
+        registered=Count('pk'),
+        score_total=Sum('voter_score'),
+        **{flag: Count('pk', filter=Q(**{flag: True})) for flag in ELECTION_FLAGS},
+    )
+    PrecinctStats.objects.bulk_create([
+        PrecinctStats(parties=parties[row['precinct']], scores=scores[row['precinct']], **row)
+        for row in totals
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0008_voter_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecinctStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precinct', models.CharField(max_length=5, unique=True)),
+                ('registered', models.IntegerField(default=0)),
+                ('score_total', models.IntegerField(default=0)),
+                ('v20state', models.IntegerField(default=0)),
+                ('v21town', models.IntegerField(default=0)),
+                ('v21primary', models.IntegerField(default=0)),
+                ('v22general', models.IntegerField(default=0)),
+                ('v23town', models.IntegerField(default=0)),
+                ('parties', models.JSONField(default=dict)),
+                ('scores', models.JSONField(default=dict)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['precinct'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['precinct'], name='voter_precinct_idx'),
+        ),
+        migrations.RunPython(build_precinct_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0009_precinctstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoterSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precinct', models.CharField(max_length=5)),
+                ('party', models.CharField(max_length=2)),
+                ('birth_year', models.IntegerField(null=True)),
+                ('voter_score', models.IntegerField()),
+                ('flags', models.PositiveSmallIntegerField()),
+                ('stratum_size', models.IntegerField()),
+                ('stratum_sample', models.IntegerField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0010_votersample'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True)),
+                ('mode', models.CharField(max_length=16)),
+                ('file_size', models.BigIntegerField()),
+                ('file_mtime', models.FloatField()),
+                ('offset', models.BigIntegerField()),
+                ('rows', models.IntegerField(default=0)),
+                ('created', models.IntegerField(default=0)),
+                ('updated', models.IntegerField(default=0)),
+                ('unchanged', models.IntegerField(default=0)),
+                ('duplicates', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('rejects_path', models.CharField(blank=True, max_length=255)),
+                ('rejects_bytes', models.BigIntegerField(default=0)),
+                ('saved', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
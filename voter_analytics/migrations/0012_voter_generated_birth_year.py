@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:10
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+# Mirrors voter_analytics.search at the time of this migration
+FTS_TABLE = 'voter_analytics_voter_fts'
+COLUMNS = 'first_name, last_name, street_number, street_name, zipcode'
+NEW = ', '.join(f'new.{c}' for c in COLUMNS.split(', '))
+OLD = ', '.join(f'old.{c}' for c in COLUMNS.split(', '))
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS voter_fts_insert AFTER INSERT ON voter_analytics_voter BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS voter_fts_delete AFTER DELETE ON voter_analytics_voter BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS voter_fts_update AFTER UPDATE OF {COLUMNS} ON voter_analytics_voter BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END""",
+]
+
+
+def restore_search_triggers(apps, schema_editor):
+    """Recreate the FTS sync triggers, which SQLite drops along with the table it remakes for the generated column."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        if cursor.fetchone() is None:
+            return
+        for sql in TRIGGERS:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0011_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_age_bucket_idx',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='age_bucket',
+        ),
+        # A column cannot be altered into a generated one, so birth_year and its indexes are recreated
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_birth_year_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_party_score_year_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_score_year_idx',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='birth_year',
+        ),
+        migrations.AddField(
+            model_name='voter',
+            name='birth_year',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.datetime.ExtractYear('dob'), output_field=models.IntegerField(null=True)),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['birth_year'], name='voter_birth_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['party', 'voter_score', 'birth_year'], name='voter_party_score_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['voter_score', 'birth_year'], name='voter_score_year_idx'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
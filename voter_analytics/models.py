@@ -7,11 +7,19 @@ and utility functions for importing voter data from CSV files.
 
 from typing import Optional
 from django.db import models
+from django.db.models.functions import ExtractYear
 from datetime import datetime, date
-import csv
-import os
-from pathlib import Path
+import hashlib
 
+# Election participation flags on Voter and their chart labels
+ELECTIONS = (
+    ("v20state", "2020 State"),
+    ("v21town", "2021 Town"),
+    ("v21primary", "2021 Primary"),
+    ("v22general", "2022 General"),
+    ("v23town", "2023 Town"),
+)
+ELECTION_FLAGS = tuple(flag for flag, _ in ELECTIONS)
 
 class Voter(models.Model):
     first_name = models.CharField(max_length=50)
@@ -33,12 +41,50 @@ class Voter(models.Model):
 
     voter_score = models.IntegerField(default=0)
 
+    # Stored copy of dob's year, kept by the database on every write, so year
+    # filters and histograms are integer index lookups
+    birth_year = models.GeneratedField(
+        expression=ExtractYear("dob"), output_field=models.IntegerField(null=True), db_persist=True,
+    )
+
+    # Natural key (the file's Voter ID Number) and a digest of the row contents,
+    # used by incremental imports to find new, changed and departed voters
+    voter_key = models.CharField(max_length=32, unique=True, null=True, blank=True)
+    row_hash = models.CharField(max_length=32, blank=True, default="")
+
     class Meta:
-        ordering = ["last_name", "first_name"]
+        ordering = ["last_name", "first_name", "id"]
+        indexes = [
+            # Matches the list ordering; keyset pagination seeks on it
+            models.Index(fields=["last_name", "first_name", "id"], name="voter_name_order_idx"),
+            models.Index(fields=["birth_year"], name="voter_birth_year_idx"),
+            # VoterFilterForm filters: party with optional score and year, score with optional year
+            models.Index(fields=["party", "voter_score", "birth_year"], name="voter_party_score_year_idx"),
+            models.Index(fields=["voter_score", "birth_year"], name="voter_score_year_idx"),
+            # Per-precinct stats refreshes aggregate one precinct at a time
+            models.Index(fields=["precinct"], name="voter_precinct_idx"),
+            # Election checkboxes alone: partial indexes over each election's voters in list order
+            *[
+                models.Index(
+                    fields=["last_name", "first_name", "id"],
+                    condition=models.Q(**{flag: True}),
+                    name=f"voter_{flag}_name_idx",
+                )
+                for flag in ELECTION_FLAGS
+            ],
+        ]
 
     def __str__(self):
         return f"{self.last_name}, {self.first_name}"
 
+    @property
+    def age(self) -> Optional[int]:
+        """Age in whole years today, from the date of birth."""
+        if not self.dob:
+            return None
+        today = date.today()
+        return today.year - self.dob.year - ((today.month, today.day) < (self.dob.month, self.dob.day))
+
     @property
     def street_address(self) -> str:
         return f"{self.street_number} {self.street_name}".strip()
@@ -53,6 +99,132 @@ class Voter(models.Model):
         return ", ".join([p for p in parts if p])
 
 
+class VoterCube(models.Model):
+    """
+    Voter counts rolled up by party x birth year x voter_score x election-flag
+    bitmask (bit i set when the voter took part in ELECTION_FLAGS[i]). Rebuilt
+    after every import; any VoterFilterForm combination is a sum over cells.
+    """
+    party = models.CharField(max_length=2)
+    birth_year = models.IntegerField(null=True)
+    voter_score = models.IntegerField()
+    flags = models.PositiveSmallIntegerField()
+    count = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.party or '-'} {self.birth_year} score {self.voter_score} flags {self.flags:05b}: {self.count}"
+
+
+class VoterSample(models.Model):
+    """
+    A stratified random sample of voters (strata are precincts) for approximate
+    graphs. Each row keeps the filterable columns like VoterCube plus its
+    stratum's population and sample size, from which estimates are weighted.
+    """
+    precinct = models.CharField(max_length=5)
+    party = models.CharField(max_length=2)
+    birth_year = models.IntegerField(null=True)
+    voter_score = models.IntegerField()
+    flags = models.PositiveSmallIntegerField()
+    stratum_size = models.IntegerField()
+    stratum_sample = models.IntegerField()
+
+    def __str__(self):
+        return f"Precinct {self.precinct} sample ({self.stratum_sample} of {self.stratum_size})"
+
+
+class PrecinctStats(models.Model):
+    """
+    Materialized per-precinct totals for the precinct dashboard: registered
+    voters, turnout per election, party mix and voter_score distribution. Rows
+    are refreshed for just the precincts an import or a Voter edit touches.
+    """
+    precinct = models.CharField(max_length=5, unique=True)
+    registered = models.IntegerField(default=0)
+    score_total = models.IntegerField(default=0)
+    v20state = models.IntegerField(default=0)
+    v21town = models.IntegerField(default=0)
+    v21primary = models.IntegerField(default=0)
+    v22general = models.IntegerField(default=0)
+    v23town = models.IntegerField(default=0)
+    # {party: voters} and {voter_score: voters}
+    parties = models.JSONField(default=dict)
+    scores = models.JSONField(default=dict)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["precinct"]
+
+    def __str__(self):
+        return f"Precinct {self.precinct}: {self.registered} voters"
+
+    def _share(self, n: int) -> float:
+        return 100.0 * n / self.registered if self.registered else 0.0
+
+    @property
+    def average_score(self) -> float:
+        return self.score_total / self.registered if self.registered else 0.0
+
+    @property
+    def turnout(self):
+        """[(election label, voters, percent of registered)] in ELECTIONS order."""
+        return [(label, getattr(self, flag), self._share(getattr(self, flag))) for flag, label in ELECTIONS]
+
+    @property
+    def party_mix(self):
+        """[(party, voters, percent)] largest first."""
+        ranked = sorted(self.parties.items(), key=lambda item: (-item[1], item[0]))
+        return [(party or "-", n, self._share(n)) for party, n in ranked]
+
+    @property
+    def score_distribution(self):
+        """[(voter_score, voters, percent)] for scores 0-5."""
+        return [(score, self.scores.get(str(score), 0), self._share(self.scores.get(str(score), 0))) for score in range(6)]
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of an unfinished import, saved in the same transaction as each
+    committed batch so a crashed import can resume after the last batch that
+    reached the database. Deleted when the import completes.
+    """
+    source = models.CharField(max_length=255, unique=True)
+    mode = models.CharField(max_length=16)
+    # Identify the file version the offset refers to
+    file_size = models.BigIntegerField()
+    file_mtime = models.FloatField()
+    # First byte of the CSV not yet committed
+    offset = models.BigIntegerField()
+    rows = models.IntegerField(default=0)
+    created = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    unchanged = models.IntegerField(default=0)
+    duplicates = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    rejects_path = models.CharField(max_length=255, blank=True)
+    rejects_bytes = models.BigIntegerField(default=0)
+    saved = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.mode} import of {self.source} at byte {self.offset:,} ({self.rows:,} rows)"
+
+
+class ImportRun(models.Model):
+    """
+    One completed import into the Voter table. The newest run's pk is the data
+    generation used to key and invalidate everything cached from voter data.
+    """
+    finished = models.DateTimeField(auto_now_add=True)
+    source = models.CharField(max_length=255, blank=True)
+    rows = models.IntegerField(default=0)
+    created = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    deleted = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Import #{self.pk} of {self.source or 'voters'} at {self.finished:%Y-%m-%d %H:%M}"
+
+
 def _parse_date(value: str) -> Optional[date]:
     """Parse a date string in various formats, handling edge cases like invalid days."""
     if not value:
@@ -81,42 +253,75 @@ def _parse_bool(value) -> bool:
     return s in {"TRUE", "T", "1", "Y", "YES"}
 
 
+# Voter fields filled from the CSV, in the order parse_voter_row returns them
+CONTENT_FIELDS = (
+    "first_name", "last_name", "street_number", "street_name", "apartment",
+    "zipcode", "dob", "registration_date", "party", "precinct",
+    "v20state", "v21town", "v21primary", "v22general", "v23town", "voter_score",
+)
+VOTER_FIELDS = CONTENT_FIELDS + ("voter_key", "row_hash")
+
+
+def _row_digest(*values) -> str:
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_voter_row(row: dict) -> tuple:
+    """Parse one csv.DictReader row of the voter file into a tuple ordered like VOTER_FIELDS."""
+    content = (
+        (row.get("First Name") or "").strip(),
+        (row.get("Last Name") or "").strip(),
+        (row.get("Residential Address - Street Number") or "").strip(),
+        (row.get("Residential Address - Street Name") or "").strip(),
+        (row.get("Residential Address - Apartment Number") or None),
+        (row.get("Residential Address - Zip Code") or "").strip(),
+        _parse_date(row.get("Date of Birth")),
+        _parse_date(row.get("Date of Registration")),
+        (row.get("Party Affiliation") or "").strip(),
+        (row.get("Precinct Number") or "").strip(),
+        _parse_bool(row.get("v20state")),
+        _parse_bool(row.get("v21town")),
+        _parse_bool(row.get("v21primary")),
+        _parse_bool(row.get("v22general")),
+        _parse_bool(row.get("v23town")),
+        int((row.get("voter_score") or 0) or 0),
+    )
+    # Files without a Voter ID Number fall back to a key derived from name, birth date and
+    # address, including the apartment so namesakes in one building stay distinct
+    apartment = (content[4] or "").strip()
+    voter_key = (row.get("Voter ID Number") or "").strip() or _row_digest(*content[:4], apartment, content[6])[:32]
+    return content + (voter_key, _row_digest(*content))
+
+
+def validate_voter_values(values: tuple) -> None:
+    """Raise ValueError if a parse_voter_row tuple would not fit the Voter columns."""
+    for name, value in zip(VOTER_FIELDS, values):
+        field = Voter._meta.get_field(name)
+        if value is None and not field.null:
+            raise ValueError(f"missing {field.verbose_name}")
+        if isinstance(value, str) and field.max_length and len(value) > field.max_length:
+            raise ValueError(f"{field.verbose_name} longer than {field.max_length} characters: {value!r}")
+
+
+def voter_from_values(values: tuple) -> Voter:
+    """Build an unsaved Voter from a tuple returned by parse_voter_row."""
+    return Voter(**dict(zip(VOTER_FIELDS, values)))
+
+
+def voter_from_row(row: dict) -> Voter:
+    """Build an unsaved Voter from one csv.DictReader row of the voter file."""
+    return voter_from_values(parse_voter_row(row))
+
+
 def load_data(csv_path: Optional[str] = None):
     """
     Load Voter rows from the given CSV path. If not provided, looks for
     voter_analytics/data/newton_voters.csv next to this app.
+
+    Rows are inserted in batches by voter_analytics.importer.bulk_import;
+    see the import_voters management command for progress reporting and
+    wipe-and-reload.
     """
-    if csv_path is None:
-        app_dir = Path(__file__).resolve().parent
-        csv_path = os.path.join(app_dir, "data", "newton_voters.csv")
-
-    created = 0
-    with open(csv_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            try:
-                party_val = (row.get("Party Affiliation") or "").strip()
-                voter = Voter(
-                    first_name=(row.get("First Name") or "").strip(),
-                    last_name=(row.get("Last Name") or "").strip(),
-                    street_number=(row.get("Residential Address - Street Number") or "").strip(),
-                    street_name=(row.get("Residential Address - Street Name") or "").strip(),
-                    apartment=(row.get("Residential Address - Apartment Number") or None),
-                    zipcode=(row.get("Residential Address - Zip Code") or "").strip(),
-                    dob=_parse_date(row.get("Date of Birth")),
-                    registration_date=_parse_date(row.get("Date of Registration")),
-                    party=party_val,
-                    precinct=(row.get("Precinct Number") or "").strip(),
-                    v20state=_parse_bool(row.get("v20state")),
-                    v21town=_parse_bool(row.get("v21town")),
-                    v21primary=_parse_bool(row.get("v21primary")),
-                    v22general=_parse_bool(row.get("v22general")),
-                    v23town=_parse_bool(row.get("v23town")),
-                    voter_score=int((row.get("voter_score") or 0) or 0),
-                )
-                voter.save()
-                created += 1
-            except Exception as e:
-                # For a real app we might log this with details
-                raise
-    return created
+    from .importer import bulk_import
+
+    return bulk_import(csv_path).created
@@ -0,0 +1,101 @@
+"""
+File: voter_analytics/pagination.py
+Author: kwabena <kwabena@bu.edu>
+Description: Keyset (seek) pagination for the voter list. Pages are addressed by
+an opaque cursor holding the (last_name, first_name, id) of a boundary row, so
+every page is an index range read instead of an ever larger OFFSET.
+
+Reference: Django complex lookups with Q objects - https://docs.djangoproject.com/en/stable/topics/db/queries/#complex-lookups-with-q-objects
+"""
+
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+KEYSET_FIELDS = ("last_name", "first_name", "id")
+
+
+def encode_cursor(voter) -> str:
+    """Return an opaque, URL-safe cursor for the sort key of `voter`."""
+    key = [getattr(voter, field) for field in KEYSET_FIELDS]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, str, int]]:
+    """Return the (last_name, first_name, id) held by a cursor, or None if it is malformed."""
+    try:
+        last_name, first_name, pk = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(last_name), str(first_name), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def _seek(qs: QuerySet, key: Tuple[str, str, int], forward: bool) -> QuerySet:
+    """
+    Restrict `qs` to rows strictly after (or before) `key` in sort order.
+
+    The leading last_name bound lets the database start a range scan on the
+    (last_name, first_name, id) index; the OR terms resolve ties.
+    """
+    last_name, first_name, pk = key
+    op = "gt" if forward else "lt"
+    bound = "gte" if forward else "lte"
+    return qs.filter(**{f"last_name__{bound}": last_name}).filter(
+        Q(**{f"last_name__{op}": last_name})
+        | Q(last_name=last_name, **{f"first_name__{op}": first_name})
+        | Q(last_name=last_name, first_name=first_name, **{f"id__{op}": pk})
+    )
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset, with cursors for its neighbours."""
+
+    def __init__(self, object_list: List, has_next: bool, has_previous: bool):
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.has_next_page
+
+    def has_previous(self) -> bool:
+        return self.has_previous_page
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        return encode_cursor(self.object_list[-1]) if self.has_next_page and self.object_list else None
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        return encode_cursor(self.object_list[0]) if self.has_previous_page and self.object_list else None
+
+
+def keyset_page(qs: QuerySet, per_page: int, after: str = None, before: str = None) -> KeysetPage:
+    """
+    Return the page of `qs` following the `after` cursor, or preceding the
+    `before` cursor, or the first page when neither is given.
+    """
+    ordering = list(KEYSET_FIELDS)
+    after_key = decode_cursor(after) if after else None
+    before_key = decode_cursor(before) if before else None
+
+    if before_key:
+        descending = [f"-{field}" for field in ordering]
+        rows = list(_seek(qs, before_key, forward=False).order_by(*descending)[:per_page + 1])
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page]
+        rows.reverse()
+        return KeysetPage(rows, has_next=True, has_previous=has_previous)
+
+    if after_key:
+        qs = _seek(qs, after_key, forward=True)
+    rows = list(qs.order_by(*ordering)[:per_page + 1])
+    return KeysetPage(rows[:per_page], has_next=len(rows) > per_page, has_previous=after_key is not None)
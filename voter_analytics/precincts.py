@@ -0,0 +1,53 @@
+"""
+File: voter_analytics/precincts.py
+Author: kwabena <kwabena@bu.edu>
+Description: Maintenance of the materialized PrecinctStats table. A precinct's
+row is recomputed from Voter with a few indexed GROUP BY queries limited to that
+precinct, so imports and edits only pay for the precincts they touch and the
+precinct dashboard never aggregates the voter table at request time.
+
+Reference: Django aggregation - https://docs.djangoproject.com/en/stable/topics/db/aggregation/
+"""
+
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from .models import ELECTION_FLAGS, PrecinctStats, Voter
+
+
+def refresh_precincts(precincts: Iterable[str]) -> int:
+    """Recompute PrecinctStats for the given precincts, deleting rows of emptied ones; returns rows written."""
+    precincts = set(precincts)
+    if not precincts:
+        return 0
+    voters = Voter.objects.order_by().filter(precinct__in=precincts)
+    totals = voters.values("precinct").annotate(
+        registered=Count("pk"),
+        score_total=Sum("voter_score"),
+        **{flag: Count("pk", filter=Q(**{flag: True})) for flag in ELECTION_FLAGS},
+    )
+    parties = defaultdict(dict)
+    for precinct, party, n in voters.values_list("precinct", "party").annotate(n=Count("pk")):
+        parties[precinct][party] = n
+    scores = defaultdict(dict)
+    for precinct, score, n in voters.values_list("precinct", "voter_score").annotate(n=Count("pk")):
+        scores[precinct][str(score)] = n
+
+    rows = [
+        PrecinctStats(parties=parties[row["precinct"]], scores=scores[row["precinct"]], **row)
+        for row in totals
+    ]
+    with transaction.atomic():
+        PrecinctStats.objects.filter(precinct__in=precincts).delete()
+        PrecinctStats.objects.bulk_create(rows)
+    return len(rows)
+
+
+def rebuild_precinct_stats() -> int:
+    """Recompute PrecinctStats for every precinct; returns the number of precincts."""
+    precincts = set(Voter.objects.order_by().values_list("precinct", flat=True).distinct())
+    precincts |= set(PrecinctStats.objects.values_list("precinct", flat=True))
+    return refresh_precincts(precincts)
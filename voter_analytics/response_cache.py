@@ -0,0 +1,124 @@
+"""
+File: voter_analytics/response_cache.py
+Author: kwabena <kwabena@bu.edu>
+Description: Filter-keyed response cache for the voter analytics views. Rendered
+pages are kept in a size-limited, in-process LRU keyed on the view, the data
+generation, the normalized VoterFilterForm data and the paging parameters. The
+same key yields an ETag, and the generation's ImportRun time is the
+Last-Modified date, so browsers and proxies revalidate with a 304.
+
+References:
+- Django conditional view processing: https://docs.djangoproject.com/en/stable/topics/conditional-view-processing/
+- collections.OrderedDict: https://docs.python.org/3/library/collections.html#collections.OrderedDict
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .metadata import current_import
+
+
+class LRUResponseCache:
+    """Thread-safe LRU of rendered responses bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, content: bytes, content_type: str):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self._entries[key] = (content, content_type)
+            self.size += len(content)
+            while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+response_cache = LRUResponseCache(
+    max_entries=getattr(settings, "VOTER_RESPONSE_CACHE_ENTRIES", 256),
+    max_bytes=getattr(settings, "VOTER_RESPONSE_CACHE_BYTES", 64 * 1024 * 1024),
+)
+
+
+def normalized_filters(cleaned_data: dict) -> str:
+    """Return the active filters as a stable string, ignoring empty and unchecked fields."""
+    active = sorted((k, str(v)) for k, v in cleaned_data.items() if v not in (None, "", False))
+    return "&".join(f"{k}={v}" for k, v in active)
+
+
+class CachedResponseMixin:
+    """
+    Serve GET requests from response_cache and answer conditional requests.
+
+    Views must provide get_filtered() (see FilteredVoterMixin). Requests with
+    invalid filters are rendered normally and not cached.
+    """
+
+    # Request parameters other than the filters that change the rendered page
+    cache_params = ()
+
+    def response_cache_key(self, generation: int) -> Optional[str]:
+        _, form, _ = self.get_filtered()
+        if form.is_bound and not form.is_valid():
+            return None
+        filters = normalized_filters(getattr(form, "cleaned_data", {}))
+        params = "&".join(f"{name}={self.request.GET.get(name, '')}" for name in self.cache_params)
+        return f"{type(self).__name__}:{generation}:{filters}:{params}"
+
+    def get(self, request, *args, **kwargs):
+        run = current_import()
+        key = self.response_cache_key(run.pk if run else 0)
+        if key is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = quote_etag(hashlib.sha1(key.encode("utf-8")).hexdigest())
+        last_modified = int(run.finished.timestamp()) if run else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if response is None:
+            cached = response_cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = super().get(request, *args, **kwargs)
+                response.render()
+                if response.status_code == 200:
+                    response_cache.set(key, response.content, response["Content-Type"])
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(response, max_age=0, must_revalidate=True)
+        return response
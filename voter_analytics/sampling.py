@@ -0,0 +1,176 @@
+"""
+File: voter_analytics/sampling.py
+Author: kwabena <kwabena@bu.edu>
+Description: Approximate chart series from a stratified random sample of voters.
+Each precinct is a stratum sampled in proportion to its size (with a floor so
+small precincts stay represented). Counts are estimated with the stratified
+expansion estimator, the average score with a ratio estimator, and each comes
+with a normal-approximation confidence interval. Work per request is bounded
+by VOTER_SAMPLE_SIZE however many voters a filter matches.
+
+References:
+- Cochran, Sampling Techniques (3rd ed.), ch. 5 (stratified random sampling) and 6.4 (ratio estimates)
+- Django QuerySet.order_by('?'): https://docs.djangoproject.com/en/stable/ref/models/querysets/#order-by
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+
+from .cube import filter_cells, flag_bit, flags_expression
+from .models import ELECTION_FLAGS, ELECTIONS, Voter, VoterSample
+
+# Two-sided 95% normal quantile
+Z_95 = 1.96
+
+
+def sample_target() -> int:
+    """Total number of voters to sample across all precincts."""
+    return getattr(settings, "VOTER_SAMPLE_SIZE", 20000)
+
+
+def min_per_stratum() -> int:
+    """Smallest sample kept for any precinct (or all of it, if smaller)."""
+    return getattr(settings, "VOTER_SAMPLE_MIN_PER_STRATUM", 50)
+
+
+def refresh_sample(precincts: Iterable[str]) -> int:
+    """Redraw the sample for the given precincts; returns the rows sampled."""
+    precincts = set(precincts)
+    if not precincts:
+        return 0
+    population = Voter.objects.count()
+    sizes = dict(
+        Voter.objects.order_by().filter(precinct__in=precincts)
+        .values_list("precinct").annotate(n=Count("pk"))
+    )
+    rows = []
+    for precinct, size in sizes.items():
+        wanted = min(size, max(min_per_stratum(), math.ceil(size * sample_target() / population)))
+        picked = list(
+            Voter.objects.filter(precinct=precinct).order_by("?")
+            .annotate(mask=flags_expression())
+            .values_list("party", "birth_year", "voter_score", "mask")[:wanted]
+        )
+        rows += [
+            VoterSample(precinct=precinct, party=party, birth_year=year, voter_score=score, flags=mask,
+                        stratum_size=size, stratum_sample=len(picked))
+            for party, year, score, mask in picked
+        ]
+    with transaction.atomic():
+        VoterSample.objects.filter(precinct__in=precincts).delete()
+        VoterSample.objects.bulk_create(rows, batch_size=5000)
+    return len(rows)
+
+
+def rebuild_sample() -> int:
+    """Redraw the sample for every precinct; returns the rows sampled."""
+    precincts = set(Voter.objects.order_by().values_list("precinct", flat=True).distinct())
+    precincts |= set(VoterSample.objects.values_list("precinct", flat=True).distinct())
+    return refresh_sample(precincts)
+
+
+def sample_available() -> bool:
+    return VoterSample.objects.exists()
+
+
+def _stratified_total(strata: Dict[str, Tuple[int, int]], sums: Dict[str, list]) -> Tuple[float, float]:
+    """
+    Estimate a population total and its variance from per-stratum sample sums.
+
+    Args:
+        strata: precinct -> (stratum_size N_h, stratum_sample n_h)
+        sums: precinct -> [sum of y, sum of y squared] over the sampled units
+            (units not listed contribute y = 0)
+    """
+    total = variance = 0.0
+    for precinct, (s1, s2) in sums.items():
+        size, sampled = strata[precinct]
+        total += size * s1 / sampled
+        if sampled > 1:
+            spread = (s2 - s1 * s1 / sampled) / (sampled - 1)
+            variance += size * size * (1 - sampled / size) * spread / sampled
+    return total, variance
+
+
+def _interval(estimate: float, variance: float, floor: float = 0.0) -> Tuple[float, float]:
+    half = Z_95 * math.sqrt(max(variance, 0.0))
+    return max(floor, estimate - half), estimate + half
+
+
+def sample_series(cleaned_data: Dict) -> Dict:
+    """
+    Return estimated chart series (as stats.chart_series) for VoterFilterForm
+    data, plus 95% confidence intervals, marked approximate.
+    """
+    rows = filter_cells(VoterSample.objects.order_by(), cleaned_data)
+    # Per-stratum sums come from GROUP BY queries; y is a 0/1 indicator except
+    # for score, so a count n is both sum y and sum y^2
+    voted = {f"voted_{flag}": F("flags").bitand(flag_bit(flag)) for flag in ELECTION_FLAGS}
+    per_stratum = rows.alias(**voted).values("precinct").annotate(
+        size=Max("stratum_size"),
+        sampled=Max("stratum_sample"),
+        n=Count("pk"),
+        score_sum=Sum("voter_score"),
+        score_squares=Sum(F("voter_score") * F("voter_score")),
+        **{flag: Count("pk", filter=Q(**{f"voted_{flag}": flag_bit(flag)})) for flag in ELECTION_FLAGS},
+    )
+    strata = {}
+    # quantity -> precinct -> [sum y, sum y^2]
+    indicators = defaultdict(dict)
+    scores = {}
+    for row in per_stratum:
+        precinct = row["precinct"]
+        strata[precinct] = (row["size"], row["sampled"])
+        indicators[("total", None)][precinct] = [row["n"], row["n"]]
+        for flag, label in ELECTIONS:
+            if row[flag]:
+                indicators[("election", label)][precinct] = [row[flag], row[flag]]
+        scores[precinct] = [row["score_sum"], row["score_squares"]]
+    for precinct, party, n in rows.values_list("precinct", "party").annotate(n=Count("pk")):
+        indicators[("party", party)][precinct] = [n, n]
+    years = rows.exclude(birth_year=None).values_list("precinct", "birth_year").annotate(n=Count("pk"))
+    for precinct, year, n in years:
+        indicators[("year", year)][precinct] = [n, n]
+
+    estimates = {key: _stratified_total(strata, sums) for key, sums in indicators.items()}
+    total, total_var = estimates.get(("total", None), (0.0, 0.0))
+
+    # Ratio estimate of the mean score, with a linearized variance over z = score - R
+    score_total, _ = _stratified_total(strata, scores)
+    average = score_total / total if total else 0.0
+    residuals = {}
+    for precinct, (s1, s2) in scores.items():
+        m = indicators[("total", None)][precinct][0]
+        residuals[precinct] = [s1 - average * m, s2 - 2 * average * s1 + average * average * m]
+    _, residual_var = _stratified_total(strata, residuals)
+    average_var = residual_var / (total * total) if total else 0.0
+
+    def series(kind):
+        return {key[1]: value for key, value in estimates.items() if key[0] == kind}
+
+    years = sorted(series("year").items())
+    parties = sorted(series("party").items(), key=lambda item: (-item[1][0], item[0]))
+    elections = series("election")
+    no_votes = (0.0, 0.0)
+    return {
+        "total": round(total),
+        "average_score": average,
+        "birth_years": [(year, round(est)) for year, (est, _) in years],
+        "parties": [(party, round(est)) for party, (est, _) in parties],
+        "elections": [(label, round(elections.get(label, no_votes)[0])) for _, label in ELECTIONS],
+        "approximate": True,
+        "sample_size": VoterSample.objects.count(),
+        "sample_matches": sum(cell[0] for cell in indicators[("total", None)].values()),
+        "intervals": {
+            "total": _interval(total, total_var),
+            "average_score": _interval(average, average_var),
+            "birth_years": [_interval(*est) for _, est in years],
+            "parties": [_interval(*est) for _, est in parties],
+            "elections": [_interval(*elections.get(label, no_votes)) for _, label in ELECTIONS],
+        },
+    }
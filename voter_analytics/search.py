@@ -0,0 +1,130 @@
+"""
+File: voter_analytics/search.py
+Author: kwabena <kwabena@bu.edu>
+Description: Name and address search for voters. On SQLite with FTS5 the
+searchable columns are indexed in an external-content trigram table kept in
+sync with Voter by triggers, so substring and prefix lookups are index probes
+ranked by bm25. Elsewhere, and for terms shorter than a trigram, search falls
+back to icontains filters.
+
+References:
+- SQLite FTS5: https://www.sqlite.org/fts5.html
+- FTS5 trigram tokenizer: https://www.sqlite.org/fts5.html#the_trigram_tokenizer
+- RawSQL expressions: https://docs.djangoproject.com/en/stable/ref/models/expressions/#raw-sql-expressions
+"""
+
+import re
+from functools import reduce
+from operator import and_, or_
+from typing import List, Tuple
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .metadata import METADATA_TIMEOUT, generation_key
+from .models import Voter
+
+SEARCH_FIELDS = ("first_name", "last_name", "street_number", "street_name", "zipcode")
+# bm25 column weights, in SEARCH_FIELDS order: names outrank address matches
+SEARCH_WEIGHTS = (5.0, 10.0, 1.0, 2.0, 1.0)
+FTS_TABLE = "voter_analytics_voter_fts"
+MAX_QUERY_LENGTH = 100
+TRIGRAM = 3
+
+_columns = ", ".join(SEARCH_FIELDS)
+_new = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_old = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+SEARCH_TRIGGERS = {
+    "voter_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS voter_fts_insert AFTER INSERT ON voter_analytics_voter BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new});
+        END""",
+    "voter_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS voter_fts_delete AFTER DELETE ON voter_analytics_voter BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+        END""",
+    "voter_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS voter_fts_update AFTER UPDATE OF {_columns} ON voter_analytics_voter BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new});
+        END""",
+}
+
+
+def search_index_available() -> bool:
+    """Whether the FTS5 search table exists in the current database; cached per data generation."""
+    if connection.vendor != "sqlite":
+        return False
+    key = generation_key("search_index")
+    available = cache.get(key)
+    if available is None:
+        available = FTS_TABLE in connection.introspection.table_names()
+        cache.set(key, available, METADATA_TIMEOUT)
+    return available
+
+
+def drop_search_triggers():
+    """Stop maintaining the search index row by row, e.g. around a full reload."""
+    if not search_index_available():
+        return
+    with connection.cursor() as cursor:
+        for name in SEARCH_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def rebuild_search_index():
+    """Recreate the sync triggers and rebuild the search index from the voter table."""
+    if not search_index_available():
+        return
+    with connection.cursor() as cursor:
+        for sql in SEARCH_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def parse_query(q: str) -> Tuple[List[str], List[str]]:
+    """Split a search string into (trigram-indexable terms, terms too short to index)."""
+    terms = re.findall(r"\w+", q[:MAX_QUERY_LENGTH].lower())
+    return [t for t in terms if len(t) >= TRIGRAM], [t for t in terms if len(t) < TRIGRAM]
+
+
+def _contains_any_field(term: str) -> Q:
+    return reduce(or_, (Q(**{f"{field}__icontains": term}) for field in SEARCH_FIELDS))
+
+
+def search_voters(qs: QuerySet, q: str) -> Tuple[QuerySet, bool]:
+    """
+    Narrow `qs` to voters whose name or address contains every term in `q`.
+
+    Returns:
+        tuple: (queryset, ranked). When ranked, results are ordered best match
+        first by bm25; otherwise they keep the name ordering.
+    """
+    indexed, short = parse_query(q)
+    if not indexed and not short:
+        return qs, False
+    if short:
+        qs = qs.filter(reduce(and_, (_contains_any_field(term) for term in short)))
+    if not indexed:
+        return qs, False
+    if not search_index_available():
+        return qs.filter(reduce(and_, (_contains_any_field(term) for term in indexed))), False
+
+    # Each term is a quoted phrase, i.e. a substring match; terms are ANDed
+    match = " ".join('"{}"'.format(term.replace('"', '""')) for term in indexed)
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    matching = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+    # bm25 needs each phrase's document frequency, so a subquery correlated on
+    # rowid would rerun the MATCH per row. LIMIT -1 stops SQLite flattening the
+    # ranked matches; it evaluates them once and looks each voter up by id.
+    rank = RawSQL(
+        f"SELECT ranked.score FROM (SELECT rowid AS voter_id, bm25({FTS_TABLE}, {weights}) AS score "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT -1) AS ranked "
+        f"WHERE ranked.voter_id = {Voter._meta.db_table}.id",
+        [match],
+        output_field=FloatField(),
+    )
+    qs = qs.filter(pk__in=matching).annotate(search_rank=rank)
+    return qs.order_by("search_rank", "id"), True
@@ -0,0 +1,39 @@
+"""
+File: voter_analytics/signals.py
+Author: kwabena <kwabena@bu.edu>
+Description: Keeps PrecinctStats current when individual voters are saved or
+deleted (e.g. from the admin). Bulk imports bypass model signals and refresh
+the precincts they touch themselves (see importer.bulk_import).
+
+Reference: Django signals - https://docs.djangoproject.com/en/stable/topics/signals/
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Voter
+from .precincts import refresh_precincts
+
+
+@receiver(pre_save, sender=Voter)
+def remember_old_precinct(sender, instance, raw=False, **kwargs):
+    """Note the stored precinct of an existing voter so a move refreshes both precincts."""
+    if raw or instance.pk is None:
+        instance._old_precinct = None
+        return
+    instance._old_precinct = Voter.objects.filter(pk=instance.pk).values_list("precinct", flat=True).first()
+
+
+@receiver(post_save, sender=Voter)
+def refresh_saved_voter_precinct(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    precincts = {instance.precinct, getattr(instance, "_old_precinct", None)} - {None}
+    transaction.on_commit(lambda: refresh_precincts(precincts))
+
+
+@receiver(post_delete, sender=Voter)
+def refresh_deleted_voter_precinct(sender, instance, **kwargs):
+    precinct = instance.precinct
+    transaction.on_commit(lambda: refresh_precincts({precinct}))
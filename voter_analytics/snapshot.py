@@ -0,0 +1,108 @@
+"""
+File: voter_analytics/snapshot.py
+Author: kwabena <kwabena@bu.edu>
+Description: Versioned on-disk snapshots of the columnar engine's voter arrays.
+An import writes one fixed-width .npy file per column plus a JSON string
+dictionary into VOTER_SNAPSHOT_DIR/<generation>/, then atomically repoints
+VOTER_SNAPSHOT_DIR/CURRENT at it. Web workers memory-map the arrays read-only,
+so every worker process shares a single copy in the OS page cache and picks up
+a new snapshot on its next request without a restart.
+
+References:
+- numpy.load mmap_mode: https://numpy.org/doc/stable/reference/generated/numpy.load.html
+- os.replace: https://docs.python.org/3/library/os.html#os.replace
+"""
+
+import json
+import os
+import shutil
+from typing import Optional
+
+from django.conf import settings
+
+from .engine import VoterColumns, engine_enabled, np
+from .metadata import current_generation
+
+ARRAY_COLUMNS = ("ids", "party_codes", "birth_year", "score", "flags")
+KEEP_SNAPSHOTS = 2
+
+
+def snapshot_root() -> Optional[str]:
+    """Return VOTER_SNAPSHOT_DIR, or None when snapshots are not configured."""
+    root = getattr(settings, "VOTER_SNAPSHOT_DIR", None)
+    return str(root) if root else None
+
+
+def current_snapshot_generation(root: str) -> Optional[int]:
+    """Return the generation CURRENT points at, or None if there is no snapshot."""
+    try:
+        with open(os.path.join(root, "CURRENT"), encoding="utf-8") as fh:
+            return int(fh.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(columns: VoterColumns, root: str) -> str:
+    """Write `columns` as a new snapshot and make it current; returns its directory."""
+    os.makedirs(root, exist_ok=True)
+    final_dir = os.path.join(root, str(columns.generation))
+    tmp_dir = os.path.join(root, f".tmp-{columns.generation}-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    for name in ARRAY_COLUMNS:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(columns, name))
+    with open(os.path.join(tmp_dir, "strings.json"), "w", encoding="utf-8") as fh:
+        json.dump({"generation": columns.generation, "parties": columns.parties}, fh)
+
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.rename(tmp_dir, final_dir)
+
+    pointer = os.path.join(root, f"CURRENT.tmp-{os.getpid()}")
+    with open(pointer, "w", encoding="utf-8") as fh:
+        fh.write(str(columns.generation))
+    os.replace(pointer, os.path.join(root, "CURRENT"))
+
+    _prune(root, columns.generation)
+    return final_dir
+
+
+def _prune(root: str, keep_generation: int):
+    """Remove all but the newest KEEP_SNAPSHOTS snapshot directories."""
+    generations = sorted(int(name) for name in os.listdir(root) if name.isdigit())
+    for generation in generations[:-KEEP_SNAPSHOTS]:
+        if generation != keep_generation:
+            # Workers still mapping these files keep them alive until they remap
+            shutil.rmtree(os.path.join(root, str(generation)), ignore_errors=True)
+
+
+def load_snapshot(generation: int, root: str = None) -> Optional[VoterColumns]:
+    """Memory-map the current snapshot if it was written for `generation`, else return None."""
+    root = root or snapshot_root()
+    if not root or current_snapshot_generation(root) != generation:
+        return None
+    directory = os.path.join(root, str(generation))
+    try:
+        with open(os.path.join(directory, "strings.json"), encoding="utf-8") as fh:
+            strings = json.load(fh)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in ARRAY_COLUMNS
+        }
+    except (OSError, ValueError):
+        return None
+    return VoterColumns(generation, parties=strings["parties"], mapped=True, **arrays)
+
+
+def snapshot_published(generation: int) -> bool:
+    """Whether CURRENT points at a snapshot of `generation` (a small file read)."""
+    root = snapshot_root()
+    return bool(root) and current_snapshot_generation(root) == generation
+
+
+def publish_snapshot() -> Optional[str]:
+    """Snapshot the current generation when the engine and VOTER_SNAPSHOT_DIR are both enabled."""
+    root = snapshot_root()
+    if not root or not engine_enabled():
+        return None
+    return write_snapshot(VoterColumns.from_database(current_generation()), root)
@@ -0,0 +1,77 @@
+/*
+ * File: voter_analytics/static/voter_analytics/js/graphs.js
+ * Author: kwabena <kwabena@bu.edu>
+ * Description: Draws the voter analytics charts in the browser from the
+ * compact series returned by the stats API (voter_analytics/api/stats/).
+ * The API URL, including the current filters, is read from #voter-charts.
+ */
+(function () {
+    "use strict";
+
+    function hideEmpty(container, name, series) {
+        if (!series.labels.length) {
+            container.querySelector('[data-series="' + name + '"]').hidden = true;
+            return true;
+        }
+        return false;
+    }
+
+    function errorBars(series) {
+        // Approximate series carry 95% bounds as low/high
+        if (!series.low) {
+            return undefined;
+        }
+        return {
+            type: "data", symmetric: false,
+            array: series.high.map(function (high, i) { return high - series.counts[i]; }),
+            arrayminus: series.low.map(function (low, i) { return series.counts[i] - low; })
+        };
+    }
+
+    function draw(container, data) {
+        var config = {responsive: true};
+
+        if (!hideEmpty(container, "birth_years", data.birth_years)) {
+            Plotly.newPlot("chart-birth-years", [{
+                type: "bar", x: data.birth_years.labels, y: data.birth_years.counts,
+                error_y: errorBars(data.birth_years)
+            }], {
+                title: {text: "Voters by Birth Year"},
+                xaxis: {title: {text: "Birth Year"}}, yaxis: {title: {text: "Voters"}}
+            }, config);
+        }
+
+        if (!hideEmpty(container, "parties", data.parties)) {
+            Plotly.newPlot("chart-parties", [{
+                type: "pie", labels: data.parties.labels, values: data.parties.counts
+            }], {title: {text: "Voters by Party Affiliation"}}, config);
+        }
+
+        Plotly.newPlot("chart-elections", [{
+            type: "bar", x: data.elections.labels, y: data.elections.counts,
+            error_y: errorBars(data.elections)
+        }], {
+            title: {text: "Participation by Election"},
+            xaxis: {title: {text: "Election"}}, yaxis: {title: {text: "Voted"}}
+        }, config);
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        var container = document.getElementById("voter-charts");
+        if (!container || typeof Plotly === "undefined") {
+            return;
+        }
+        fetch(container.dataset.statsUrl, {headers: {Accept: "application/json"}})
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error("stats API returned " + response.status);
+                }
+                return response.json();
+            })
+            .then(function (data) { draw(container, data); })
+            .catch(function (error) {
+                container.innerHTML = '<div class="col-12"><div class="alert alert-warning">' +
+                    "Charts could not be loaded: " + error.message + "</div></div>";
+            });
+    });
+})();
@@ -0,0 +1,42 @@
+"""
+File: voter_analytics/stats.py
+Author: kwabena <kwabena@bu.edu>
+Description: Aggregate chart series for the voter analytics graphs. Every series
+is computed by the database with GROUP BY and conditional COUNT (SUM(CASE ...))
+queries, so only aggregate rows are returned however many voters match.
+
+Reference: Django conditional aggregation - https://docs.djangoproject.com/en/stable/ref/models/conditional-expressions/#conditional-aggregation
+"""
+
+from typing import Dict
+
+from django.db.models import Avg, Count, Q, QuerySet
+
+from .models import ELECTIONS
+
+
+def chart_series(qs: QuerySet) -> Dict:
+    """
+    Compute the chart series for a filtered Voter queryset in three queries.
+
+    Returns:
+        dict: total, average_score, birth_years [(year, count)],
+        parties [(party, count)] and elections [(label, count)]
+    """
+    qs = qs.order_by()
+    summary = qs.aggregate(
+        total=Count("pk"),
+        average_score=Avg("voter_score"),
+        **{flag: Count("pk", filter=Q(**{flag: True})) for flag, _ in ELECTIONS},
+    )
+    birth_years = list(
+        qs.values_list("birth_year").annotate(n=Count("pk")).order_by("birth_year")
+    )
+    parties = list(qs.values_list("party").annotate(n=Count("pk")).order_by("-n", "party"))
+    return {
+        "total": summary["total"],
+        "average_score": summary["average_score"] or 0.0,
+        "birth_years": [(year, n) for year, n in birth_years if year is not None],
+        "parties": parties,
+        "elections": [(label, summary[flag]) for flag, label in ELECTIONS],
+    }
@@ -1,3 +1,117 @@
-from django.test import TestCase
+"""
+File: voter_analytics/tests.py
+Author: kwabena <kwabena@bu.edu>
+Description: Query-plan regression tests for the voter filters. Every filter
+combination VoterFilterForm can produce is run through _filtered_queryset, and
+the list page, count and chart queries it issues are checked with SQLite's
+EXPLAIN QUERY PLAN so none of them scans the voter table. The only scan allowed
+is of a partial election index whose flag is part of the filter; the charts for
+election-only filters have no selective index and must come from the cube.
 
-# Create your tests here.
+Reference: SQLite EXPLAIN QUERY PLAN - https://www.sqlite.org/eqp.html
+"""
+
+import itertools
+import re
+import unittest
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .cube import rebuild_cube
+from .models import ELECTION_FLAGS, Voter
+from .stats import chart_series
+from .views import VoterListView, _filtered_queryset, _filtered_series
+
+VOTER_SCAN = re.compile(r"\bSCAN (TABLE )?voter_analytics_voter\b")
+PARTIAL_INDEX = re.compile(r"\bUSING (COVERING )?INDEX voter_(?P<flag>\w+)_name_idx\b")
+INDEXED_FILTERS = {"party", "dob_min_year", "dob_max_year", "voter_score"}
+
+
+def filter_combinations():
+    """Yield every non-empty VoterFilterForm query dict over the test data's choices."""
+    parties = [None, "D"]
+    year_ranges = [None, (1950, 1990)]
+    scores = [None, "3"]
+    flag_sets = [
+        combo for size in range(len(ELECTION_FLAGS) + 1) for combo in itertools.combinations(ELECTION_FLAGS, size)
+    ]
+    for party, years, score, flags in itertools.product(parties, year_ranges, scores, flag_sets):
+        params = {}
+        if party:
+            params["party"] = party
+        if years:
+            params["dob_min_year"], params["dob_max_year"] = str(years[0]), str(years[1])
+        if score:
+            params["voter_score"] = score
+        for flag in flags:
+            params[flag] = "on"
+        if params:
+            yield params
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite-specific")
+@override_settings(VOTER_ANALYTICS_ENGINE=False, VOTER_ANALYTICS_USE_CUBE=True)
+class FilterQueryPlanTests(TestCase):
+    """Fail if any filtered voter query is planned as a scan of the voter table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        voters = []
+        for i, (party, year) in enumerate(itertools.product(["D", "R", "U"], [1950, 1970, 1990])):
+            dob = date(year, 1 + i % 12, 1 + i)
+            flags = {flag: bool((i >> bit) & 1) for bit, flag in enumerate(ELECTION_FLAGS)}
+            voters.append(Voter(
+                first_name=f"First{i}", last_name=f"Last{i}", street_number=str(i), street_name="Main St",
+                zipcode="02459", dob=dob, registration_date=date(2010, 1, 1), party=party, precinct="1",
+                voter_score=i % 6, voter_key=str(i), **flags,
+            ))
+        Voter.objects.bulk_create(voters)
+        rebuild_cube()
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def assertNoFullScan(self, sql, params):
+        """Fail on any scan of the voter table except a partial index of a filtered election."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = [row[-1] for row in cursor.fetchall()]
+        scans = [
+            step for step in plan
+            if VOTER_SCAN.search(step)
+            and not ((match := PARTIAL_INDEX.search(step)) and match.group("flag") in params)
+        ]
+        self.assertFalse(scans, f"scan of voter table:\n{sql}\nplan: {plan}")
+
+    def test_filter_combinations_use_indexes(self):
+        per_page = VoterListView.paginate_by
+        for params in filter_combinations():
+            with self.subTest(**params):
+                qs, form, _ = _filtered_queryset(self.factory.get("/", params))
+                self.assertTrue(form.is_valid(), form.errors)
+                with CaptureQueriesContext(connection) as captured:
+                    list(qs.order_by(*VoterListView.ordering)[:per_page + 1])
+                    qs.count()
+                    if INDEXED_FILTERS & params.keys():
+                        chart_series(qs)
+                for query in captured:
+                    if "voter_analytics_voter" in query["sql"]:
+                        self.assertNoFullScan(query["sql"], params)
+
+    def test_election_only_charts_come_from_cube(self):
+        for params in filter_combinations():
+            if INDEXED_FILTERS & params.keys():
+                continue
+            with self.subTest(**params):
+                qs, form, _ = _filtered_queryset(self.factory.get("/", params))
+                self.assertTrue(form.is_valid(), form.errors)
+                with CaptureQueriesContext(connection) as captured:
+                    series = _filtered_series(qs, form.cleaned_data)
+                self.assertEqual(series["total"], qs.count())
+                voter_queries = [q["sql"] for q in captured if '"voter_analytics_voter"' in q["sql"]]
+                self.assertFalse(voter_queries, f"chart series read the voter table: {voter_queries}")
@@ -8,7 +8,7 @@ Reference: Django URL dispatcher - https://docs.djangoproject.com/en/stable/topi
 """
 
 from django.urls import path
-from .views import VoterListView, VoterDetailView, GraphsView
+from .views import VoterListView, VoterDetailView, GraphsView, PrecinctDashboardView, export_voters, plotly_js, stats_api
 
 app_name = 'voter_analytics'
 
@@ -16,4 +16,9 @@ urlpatterns = [
     path('', VoterListView.as_view(), name='voters'),
     path('voter/<int:pk>/', VoterDetailView.as_view(), name='voter'),
     path('graphs/', GraphsView.as_view(), name='graphs'),
+    path('precincts/', PrecinctDashboardView.as_view(), name='precincts'),
+    path('export/<str:fmt>/', export_voters, name='export'),
+    path('api/stats/', stats_api, name='stats_api'),
+    path('api/stats/<str:series>/', stats_api, name='stats_api_series'),
+    path('js/<str:filename>', plotly_js, name='plotly_js'),
 ]
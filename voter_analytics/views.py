@@ -9,28 +9,44 @@ References:
 - Django DetailView documentation: https://docs.djangoproject.com/en/stable/ref/class-based-views/generic-display/#detailview
 - Django QuerySet filtering: https://docs.djangoproject.com/en/stable/topics/db/queries/#retrieving-specific-objects-with-filters
 - Plotly Python documentation: https://plotly.com/python/
-- Python Counter class: https://docs.python.org/3/library/collections.html#collections.Counter
+- Django aggregation: https://docs.djangoproject.com/en/stable/topics/db/aggregation/
+- Django REST framework function views: https://www.django-rest-framework.org/api-guide/views/#function-based-views
 """
 
-from collections import Counter
-from datetime import date
+import hashlib
 from urllib.parse import urlencode
 from typing import Tuple, Dict
 
+from django.conf import settings
 from django.db.models import QuerySet
 from django.views.generic import ListView, DetailView, TemplateView
-from django.http import HttpRequest
+from django.http import FileResponse, Http404, HttpRequest, HttpResponseBadRequest, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 
-from .models import Voter
+from .models import ELECTIONS, ELECTION_FLAGS, PrecinctStats, Voter
 from .forms import VoterFilterForm
+from .charts import PLOTLY_DIR, plotly_js_url, render_figures, vendored_plotly_name
+from .cube import cube_available, cube_count, cube_series
+from .engine import get_engine
+from .export import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_lines
+from .metadata import current_generation, estimate_count, filter_metadata
+from .pagination import keyset_page
+from .response_cache import CachedResponseMixin, normalized_filters
+from .sampling import sample_available, sample_series
+from .search import search_voters
+from .stats import chart_series
 
 
-def _filtered_queryset(request: HttpRequest) -> Tuple[QuerySet, VoterFilterForm, Dict]:
+def filter_voters(data) -> Tuple[QuerySet, VoterFilterForm, Dict]:
     """
-    Create a filtered queryset of voters based on request parameters.
+    Create a filtered queryset of voters from VoterFilterForm data.
     
     Args:
-        request: HTTP request containing filter parameters
+        data: QueryDict or dict of filter parameters (empty for no filters)
         
     Returns:
         tuple: (filtered_queryset, form_instance, metadata_dict)
@@ -39,19 +55,14 @@ def _filtered_queryset(request: HttpRequest) -> Tuple[QuerySet, VoterFilterForm,
     """
     qs = Voter.objects.all()
 
-    # Dynamic choices
-    parties = list(
-        Voter.objects.exclude(party="").values_list("party", flat=True).distinct().order_by("party")
-    )
-    years = list(
-        Voter.objects.values_list("dob", flat=True).order_by("dob")
-    )
-    year_choices = sorted({d.year for d in years if d})
+    # Dynamic choices, cached per data generation
+    meta = filter_metadata()
 
     form = VoterFilterForm(
-        data=request.GET or None,
-        party_choices=parties,
-        year_choices=year_choices,
+        data=data or None,
+        party_choices=meta["party_choices"],
+        year_choices=meta["year_choices"],
+        score_choices=meta["score_choices"],
     )
 
     if form.is_valid():
@@ -61,13 +72,13 @@ def _filtered_queryset(request: HttpRequest) -> Tuple[QuerySet, VoterFilterForm,
         if party:
             qs = qs.filter(party=party)
 
-        # dob range
+        # birth year range (indexed birth_year column)
         min_year = data.get("dob_min_year")
         max_year = data.get("dob_max_year")
         if min_year:
-            qs = qs.filter(dob__gte=date(int(min_year), 1, 1))
+            qs = qs.filter(birth_year__gte=int(min_year))
         if max_year:
-            qs = qs.filter(dob__lte=date(int(max_year), 12, 31))
+            qs = qs.filter(birth_year__lte=int(max_year))
 
         # voter score
         score = data.get("voter_score")
@@ -75,19 +86,85 @@ def _filtered_queryset(request: HttpRequest) -> Tuple[QuerySet, VoterFilterForm,
             qs = qs.filter(voter_score=int(score))
 
         # elections (checkboxes)
-        for flag in ["v20state", "v21town", "v21primary", "v22general", "v23town"]:
+        for flag in ELECTION_FLAGS:
             if data.get(flag):
                 qs = qs.filter(**{flag: True})
 
-    return qs, form, {"party_choices": parties, "year_choices": year_choices}
+    return qs, form, meta
+
+
+def _filtered_queryset(request: HttpRequest) -> Tuple[QuerySet, VoterFilterForm, Dict]:
+    """Create a filtered queryset of voters from the request's query parameters."""
+    return filter_voters(request.GET)
+
+
+def approximate_requested(request: HttpRequest) -> bool:
+    """Whether the request asks for sampled series (?mode=approx, default VOTER_GRAPHS_MODE)."""
+    return request.GET.get("mode", getattr(settings, "VOTER_GRAPHS_MODE", "exact")) == "approx"
+
+
+def _filtered_series(qs: QuerySet, cleaned_data: Dict, approximate: bool = False) -> Dict:
+    """
+    Return the chart series for the filtered voters.
+
+    With `approximate` and a drawn sample, returns estimates with confidence
+    intervals from the stratified VoterSample (see sampling.sample_series).
+    Otherwise the exact series come from the in-process columnar engine when
+    it is enabled, else the precomputed VoterCube when it is built, else
+    aggregate queries over `qs` (see stats.chart_series). No Voter rows are
+    loaded in any case.
+    """
+    if approximate and sample_available():
+        return sample_series(cleaned_data)
+    engine = get_engine()
+    if engine is not None:
+        return engine.series(cleaned_data)
+    if cube_available():
+        return cube_series(cleaned_data)
+    return chart_series(qs)
+
+
+class FilteredVoterMixin:
+    """Run _filtered_queryset once per request and reuse its results."""
+
+    def get_filtered(self) -> Tuple[QuerySet, VoterFilterForm, Dict]:
+        if not hasattr(self, "_filtered"):
+            self._filtered = _filtered_queryset(self.request)
+        return self._filtered
+
+    def get_cleaned_filters(self) -> Dict:
+        """Return the applied filter values, or {} when no valid filters were submitted."""
+        _, form, _ = self.get_filtered()
+        return getattr(form, "cleaned_data", {})
+
+    def get_series(self) -> Dict:
+        """Return the chart series for the applied filters, computed once per request."""
+        if not hasattr(self, "_series"):
+            qs, _, _ = self.get_filtered()
+            self._series = _filtered_series(qs, self.get_cleaned_filters(), approximate_requested(self.request))
+        return self._series
 
 
-class VoterListView(ListView):
+class VoterListView(CachedResponseMixin, FilteredVoterMixin, ListView):
     """
     Display a paginated list of voters with filtering capabilities.
     
     Supports filtering by party affiliation, birth year range, voter score,
     and participation in specific elections.
+
+    With VOTER_ANALYTICS_ENGINE on, matching ids and counts come from the
+    in-process columnar engine and pages are numbered. Otherwise, with
+    VOTER_LIST_PAGINATION = "keyset" (the default) pages are addressed by
+    ?after=/?before= cursors on (last_name, first_name, id), so deep pages cost
+    the same as the first; a ?page= request still uses numbered pages. With
+    VOTER_LIST_COUNT_MODE = "estimated" the filtered count comes from cached
+    column statistics instead of a COUNT(*) over the filtered rows.
+
+    A ?q= search narrows the list to voters whose name or address contains
+    every term (see search.search_voters); ranked results use numbered pages.
+
+    Rendered pages are cached per filter, page and data generation (see
+    response_cache), with ETag/Last-Modified revalidation.
     
     Reference: Django ListView - https://docs.djangoproject.com/en/stable/ref/class-based-views/generic-display/#listview
     """
@@ -95,19 +172,78 @@ class VoterListView(ListView):
     template_name = "voter_analytics/voter_list.html"
     paginate_by = 100
     context_object_name = "voters"
-    ordering = ["last_name", "first_name"]
+    ordering = ["last_name", "first_name", "id"]
+    cursor_params = ("after", "before", "page")
+    cache_params = cursor_params + ("q",)
+
+    def get_search(self) -> str:
+        return self.request.GET.get("q", "").strip()
+
+    def get_searched(self) -> Tuple[QuerySet, bool]:
+        """Return (queryset, ranked) for the filters and search, computed once per request."""
+        if not hasattr(self, "_searched"):
+            qs, _, _ = self.get_filtered()
+            self._searched = search_voters(qs, self.get_search())
+        return self._searched
 
     def get_queryset(self):
-        qs, form, _ = _filtered_queryset(self.request)
-        return qs.order_by(*self.ordering)
+        qs, ranked = self.get_searched()
+        return qs if ranked else qs.order_by(*self.ordering)
+
+    def use_keyset(self) -> bool:
+        if self.get_search() or get_engine() is not None:
+            return False
+        if "page" in self.request.GET and not ({"after", "before"} & set(self.request.GET)):
+            return False
+        return getattr(settings, "VOTER_LIST_PAGINATION", "keyset") == "keyset"
+
+    def paginate_queryset(self, queryset, page_size):
+        engine = None if self.get_search() else get_engine()
+        if engine is not None:
+            # Page through the engine's matching id array; fetch only the shown rows
+            ids = engine.matching_ids(self.get_cleaned_filters())
+            paginator, page, page_ids, is_paginated = super().paginate_queryset(ids, page_size)
+            voters = Voter.objects.in_bulk(page_ids.tolist())
+            page.object_list = [voters[pk] for pk in page_ids.tolist() if pk in voters]
+            return paginator, page, page.object_list, is_paginated
+        if not self.use_keyset():
+            return super().paginate_queryset(queryset, page_size)
+        page = keyset_page(
+            queryset,
+            page_size,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+        return None, page, page.object_list, page.has_next() or page.has_previous()
+
+    def get_filtered_count(self, context) -> Tuple[int, bool]:
+        """Return (filtered_count, is_estimate) without counting twice."""
+        qs, form, meta = self.get_filtered()
+        cleaned = self.get_cleaned_filters()
+        if context.get("paginator") is not None:
+            return context["paginator"].count, False
+        if not any(cleaned.get(field) not in (None, "", False) for field in cleaned):
+            return meta["total_count"], False
+        if cube_available():
+            return cube_count(cleaned), False
+        if getattr(settings, "VOTER_LIST_COUNT_MODE", "exact") == "estimated":
+            return estimate_count(cleaned), True
+        return qs.count(), False
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        qs, form, meta = _filtered_queryset(self.request)
+        qs, form, meta = self.get_filtered()
+        filtered_count, count_is_estimate = self.get_filtered_count(context)
+        filter_params = {k: v for k, v in self.request.GET.lists() if k not in self.cursor_params}
         context.update({
             "filter_form": form,
-            "total_count": Voter.objects.count(),
-            "filtered_count": qs.count(),
+            "total_count": meta["total_count"],
+            "filtered_count": filtered_count,
+            "count_is_estimate": count_is_estimate,
+            "keyset": context["paginator"] is None,
+            "filter_query": urlencode(filter_params, doseq=True),
+            "search_query": self.get_search(),
+            "search_ranked": self.get_searched()[1],
         })
         return context
 
@@ -125,7 +261,7 @@ class VoterDetailView(DetailView):
     context_object_name = "voter"
 
 
-class GraphsView(ListView):
+class GraphsView(CachedResponseMixin, FilteredVoterMixin, TemplateView):
     """
     Display interactive data visualizations and analytics for voter data.
     
@@ -133,20 +269,23 @@ class GraphsView(ListView):
     - Birth year distribution (bar chart)
     - Party affiliation distribution (pie chart) 
     - Election participation rates (bar chart)
+
+    Series come from _filtered_series; ?mode=approx switches to estimates
+    from the stratified voter sample, whose cost does not grow with the
+    selection, and ?mode=exact back. With VOTER_GRAPHS_CLIENT_RENDER on (the default) graphs.js draws
+    the charts from the stats API, and the page only computes the series for
+    the approximate-mode note; otherwise the figures are rendered here and
+    cached separately in charts.render_figures. Rendered pages are cached
+    like VoterListView's.
     
     Falls back to summary statistics if Plotly is not available.
     
     References:
     - Plotly Python documentation: https://plotly.com/python/
-    - Python Counter class: https://docs.python.org/3/library/collections.html#collections.Counter
+    - Django aggregation: https://docs.djangoproject.com/en/stable/topics/db/aggregation/
     """
-    model = Voter
     template_name = "voter_analytics/graphs.html"
-    context_object_name = "voters"
-
-    def get_queryset(self):
-        qs, form, _ = _filtered_queryset(self.request)
-        return qs
+    cache_params = ("mode",)
 
     def get_context_data(self, **kwargs):
         """
@@ -160,58 +299,171 @@ class GraphsView(ListView):
             dict: Context dictionary with chart HTML and form data
         """
         context = super().get_context_data(**kwargs)
-        qs, form, _ = _filtered_queryset(self.request)
-
-        # Attempt to build Plotly graphs; if plotly not available, show placeholders
-        birth_year_html = party_html = elections_html = None
-        try:
-            import plotly.express as px
-
-            # Birth year distribution
-            years = [v.dob.year for v in qs if v.dob]
-            if years:
-                year_counts = Counter(years)
-                fig1 = px.bar(x=sorted(year_counts.keys()), y=[year_counts[y] for y in sorted(year_counts.keys())],
-                              labels={"x": "Birth Year", "y": "Voters"}, title="Voters by Birth Year")
-                birth_year_html = fig1.to_html(full_html=False, include_plotlyjs="cdn")
-
-            # Party affiliation distribution
-            parties = [v.party or "" for v in qs]
-            if parties:
-                party_counts = Counter(parties)
-                labels = list(party_counts.keys())
-                values = [party_counts[p] for p in labels]
-                fig2 = px.pie(names=labels, values=values, title="Voters by Party Affiliation")
-                party_html = fig2.to_html(full_html=False, include_plotlyjs=False)
-
-            # Participation counts per election
-            elections = [
-                ("2020 State", sum(1 for v in qs if v.v20state)),
-                ("2021 Town", sum(1 for v in qs if v.v21town)),
-                ("2021 Primary", sum(1 for v in qs if v.v21primary)),
-                ("2022 General", sum(1 for v in qs if v.v22general)),
-                ("2023 Town", sum(1 for v in qs if v.v23town)),
-            ]
-            labels = [e[0] for e in elections]
-            values = [e[1] for e in elections]
-            fig3 = px.bar(x=labels, y=values, labels={"x": "Election", "y": "Voted"}, title="Participation by Election")
-            elections_html = fig3.to_html(full_html=False, include_plotlyjs=False)
-
-        except Exception:
-            # Leave HTML as None; template will show a helpful message
-            pass
-
-        # Calculate average voter score
-        average_score = 0.0
-        if qs.exists():
-            total_score = sum(v.voter_score for v in qs)
-            average_score = total_score / qs.count()
-
+        _, form, _ = self.get_filtered()
+        plotly_url = plotly_js_url()
+        client_render = getattr(settings, "VOTER_GRAPHS_CLIENT_RENDER", True)
+        approx_requested = approximate_requested(self.request)
         context.update({
             "filter_form": form,
-            "average_score": average_score,
-            "graph_birth_year_html": birth_year_html,
-            "graph_party_html": party_html,
-            "graph_elections_html": elections_html,
+            "plotly_js_url": plotly_url,
+            "client_render": client_render,
+            "stats_url": f"{reverse('voter_analytics:stats_api')}?{self.request.GET.urlencode()}",
+            "approx_requested": approx_requested,
+            "exact_query": self._mode_query("exact"),
+            "approx_query": self._mode_query("approx"),
+        })
+        if client_render and plotly_url and not approx_requested:
+            # graphs.js fetches the charts from the stats API; the page needs no series
+            return context
+
+        series = self.get_series()
+        if client_render:
+            # graphs.js draws the charts from the stats API; no figures in the page
+            figures = {"birth_year": None, "party": None, "elections": None}
+        else:
+            # Figure fragments are cached per filter and generation; None if Plotly is unavailable
+            signature = f"{normalized_filters(self.get_cleaned_filters())}:{series.get('approximate', False)}"
+            figures = render_figures(series, signature)
+
+        context.update({
+            "total_voters": series["total"],
+            "party_count": len(series["parties"]),
+            "average_score": series["average_score"],
+            "graph_birth_year_html": figures["birth_year"],
+            "graph_party_html": figures["party"],
+            "graph_elections_html": figures["elections"],
+            "approximate": series.get("approximate", False),
+            "intervals": series.get("intervals"),
+            "sample_size": series.get("sample_size"),
+            "sample_matches": series.get("sample_matches"),
         })
         return context
+
+    def _mode_query(self, mode: str) -> str:
+        params = {k: v for k, v in self.request.GET.lists() if k != "mode"}
+        params["mode"] = [mode]
+        return urlencode(params, doseq=True)
+
+
+def plotly_js(request: HttpRequest, filename: str) -> FileResponse:
+    """
+    Serve the vendored plotly.js bundle written by the vendor_plotlyjs command.
+
+    The file name carries a content hash, so browsers may cache it forever.
+    """
+    if filename != vendored_plotly_name():
+        raise Http404("plotly.js has not been vendored")
+    response = FileResponse(open(PLOTLY_DIR / filename, "rb"), content_type="text/javascript")
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+class PrecinctDashboardView(ListView):
+    """
+    Show registered voters, turnout per election, party mix and voter_score
+    distribution for every precinct.
+
+    Reads only the materialized PrecinctStats rows (see precincts.py), which
+    imports and voter edits keep current, so no voter rows are aggregated here.
+    """
+    model = PrecinctStats
+    template_name = "voter_analytics/precincts.html"
+    context_object_name = "precincts"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["election_labels"] = [label for _, label in ELECTIONS]
+        context["total_registered"] = sum(p.registered for p in context["precincts"])
+        return context
+
+
+STATS_SERIES = ("summary", "birth_years", "parties", "elections")
+
+
+def _columns(pairs, intervals=None) -> Dict:
+    """
+    Turn [(label, count), ...] into parallel lists, the shape Plotly traces take,
+    adding "low"/"high" confidence bounds for approximate series.
+    """
+    columns = {"labels": [label for label, _ in pairs], "counts": [n for _, n in pairs]}
+    if intervals is not None:
+        columns["low"] = [round(low) for low, _ in intervals]
+        columns["high"] = [round(high) for _, high in intervals]
+    return columns
+
+
+@api_view(['GET'])
+def stats_api(request, series=None):
+    """
+    Return aggregate chart series for voters matching the VoterFilterForm query
+    parameters: birth-year counts, party counts, per-election turnout and the
+    average voter score. `series` limits the payload to one of STATS_SERIES.
+    With ?mode=approx, once a sample has been drawn, the series are sample
+    estimates with 95% bounds.
+
+    Responses carry an ETag for the data generation and filters, so clients
+    revalidate with a 304 until the next import.
+    """
+    if series is not None and series not in STATS_SERIES:
+        raise Http404(f"Unknown series {series!r}")
+    qs, form, _ = _filtered_queryset(request)
+    if form.is_bound and not form.is_valid():
+        return Response({"errors": form.errors}, status=400)
+    cleaned = getattr(form, "cleaned_data", {})
+
+    generation = current_generation()
+    approximate = approximate_requested(request)
+    key = f"stats:{generation}:{normalized_filters(cleaned)}:{series}:{approximate}"
+    etag = quote_etag(hashlib.sha1(key.encode("utf-8")).hexdigest())
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    data = _filtered_series(qs, cleaned, approximate)
+    intervals = data.get("intervals") or {}
+    payload = {
+        "generation": generation,
+        "approximate": data.get("approximate", False),
+        "summary": {
+            "total": data["total"],
+            "average_score": round(data["average_score"] or 0.0, 3),
+            "party_count": len(data["parties"]),
+        },
+        "birth_years": _columns(data["birth_years"], intervals.get("birth_years")),
+        "parties": _columns(data["parties"], intervals.get("parties")),
+        "elections": _columns(data["elections"], intervals.get("elections")),
+    }
+    if intervals:
+        payload["summary"].update({
+            "total_interval": [round(bound) for bound in intervals["total"]],
+            "average_score_interval": [round(bound, 3) for bound in intervals["average_score"]],
+            "sample_size": data["sample_size"],
+            "sample_matches": data["sample_matches"],
+        })
+    if series is not None:
+        payload = {"generation": generation, "approximate": payload["approximate"], series: payload[series]}
+    response = Response(payload)
+    response["ETag"] = etag
+    patch_cache_control(response, max_age=0, must_revalidate=True)
+    return response
+
+
+def export_voters(request: HttpRequest, fmt: str) -> StreamingHttpResponse:
+    """
+    Stream every voter matching the VoterFilterForm query parameters and the
+    ?q= search, as on the list page, as CSV or NDJSON. Memory use is bounded by
+    one chunk of rows whatever the export size.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise Http404(f"Unknown export format {fmt!r}")
+    qs, form, _ = _filtered_queryset(request)
+    if form.is_bound and not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text(), content_type="text/plain")
+    qs, _ = search_voters(qs, request.GET.get("q", "").strip())
+
+    response = StreamingHttpResponse(
+        export_lines(qs, fmt, chunk_size=DEFAULT_CHUNK_SIZE),
+        content_type=EXPORT_FORMATS[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="voters.{fmt}"'
+    return response